@@ -1,12 +1,22 @@
-"""消息处理器协议定义。"""
+"""消息处理器协议定义与共享的下行工具。"""
 
 from __future__ import annotations
 
-from typing import Any, Dict, Protocol
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Protocol, Tuple
 
+import orjson
 from fastapi import WebSocket
 
 from api.handlers.context import HandlerContext
+from core.monitor.event_types import MonitorEventType
+
+
+# 热路径上每条下行都会用到，导入时解析一次枚举成员
+_MESSAGE_SENT = MonitorEventType.MESSAGE_SENT
+
+# 下行 JSON 的 orjson 选项：datetime 交给 orjson 原生编码，无时区的按 UTC 处理
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC
 
 
 class MessageHandler(Protocol):
@@ -19,3 +29,63 @@ class MessageHandler(Protocol):
         处理消息并返回响应预览字符串。
         """
         ...
+
+
+async def send_payload(websocket: WebSocket, payload: Dict[str, Any]) -> str:
+    """
+    序列化一次并以文本帧下发，返回同一字符串作为预览。
+
+    Mod 与监控前端都按文本帧 JSON.parse，ASGI 文本帧又要求 str，
+    因此这里只做一次 orjson 编码加一次解码，不改用二进制帧。
+    """
+    serialized = orjson.dumps(payload, option=ORJSON_OPTIONS).decode("utf-8")
+    await websocket.send_text(serialized)
+    return serialized
+
+
+def record_send(context: HandlerContext, message_type: str) -> None:
+    """记录监控事件与指标。"""
+    context.metrics.record_message_sent(message_type)
+    context.event_bus.publish(
+        _MESSAGE_SENT,
+        {
+            "client_id": context.client_id,
+            "message_type": message_type,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+
+async def send_engine_outputs(
+    websocket: WebSocket,
+    context: HandlerContext,
+    session_id: str,
+    outputs: Iterable[Dict[str, Any]],
+) -> str:
+    """
+    下行引擎输出并返回最后一条的预览。
+
+    Mod 协议没有批量信封，每条输出仍是一帧；这里先把整批序列化完，
+    再连续发送，避免在两次发送之间穿插编码工作。
+    """
+    frames: List[Tuple[str, str]] = []
+    for output in outputs:
+        # 引擎会话每次都返回新解析出的字典，直接原地补 session_id，无需复制
+        output.setdefault("session_id", session_id)
+        serialized = orjson.dumps(output, option=ORJSON_OPTIONS).decode("utf-8")
+        frames.append((str(output.get("type", "unknown")), serialized))
+
+    # 事件总线会在历史里保留事件字典的引用，不能复用同一个模板对象；
+    # 只预先构造公共字段，每条事件做一次浅拷贝。
+    event_base = {
+        "client_id": context.client_id,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    for msg_type, serialized in frames:
+        await websocket.send_text(serialized)
+        context.metrics.record_message_sent(msg_type)
+        context.event_bus.publish(
+            _MESSAGE_SENT, {**event_base, "message_type": msg_type}
+        )
+
+    return frames[-1][1] if frames else ""
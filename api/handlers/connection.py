@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 from fastapi import WebSocket
 
-from api.handlers.base import MessageHandler
+from api.handlers.base import MessageHandler, send_payload
 from api.handlers.context import HandlerContext
 from core.monitor.event_types import MonitorEventType
 
 
+_MESSAGE_SENT = MonitorEventType.MESSAGE_SENT
+
+
 class ConnectionInitHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
@@ -22,11 +24,11 @@ class ConnectionInitHandler(MessageHandler):
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "data": {"client_id": context.client_id},
         }
-        await websocket.send_json(response)
+        payload = await send_payload(websocket, response)
 
         context.metrics.record_message_sent("connection_ack")
         context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
+            _MESSAGE_SENT,
             {
                 "client_id": context.client_id,
                 "message_type": "connection_ack",
@@ -34,4 +36,4 @@ class ConnectionInitHandler(MessageHandler):
             },
         )
 
-        return json.dumps(response)
+        return payload
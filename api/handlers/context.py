@@ -12,9 +12,9 @@ from core.interfaces import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class HandlerContext:
-    """消息处理器共享上下文。"""
+    """消息处理器共享上下文（每个连接创建一次，字段在连接期间不变）。"""
 
     client_id: str
     event_bus: EventBusInterface
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
+import orjson
 from fastapi import WebSocket
 
-from api.handlers.base import MessageHandler
+from api.handlers.base import ORJSON_OPTIONS, MessageHandler
 from api.handlers.context import HandlerContext
 from api.protocol import CompactProtocol
 from core.monitor.event_types import MonitorEventType
@@ -17,32 +18,43 @@ from core.monitor.token_tracker import TokenTracker
 
 logger = logging.getLogger("api.handlers.conversation")
 
+_MESSAGE_SENT = MonitorEventType.MESSAGE_SENT
+
+_DEFAULT_PLAYER_NAME = "玩家"
+_DEFAULT_COMPANION_NAME = "AICompanion"
+_DEFAULT_REPLY = "抱歉，我暂时无法响应，请稍后再试。"
+
+_parse_conversation_request = CompactProtocol.build_specialized("conversation_request")
+
+
+@lru_cache(maxsize=256)
+def _system_prompt(companion_name: str) -> str:
+    """按伙伴名缓存系统提示词，保持前缀稳定以命中上游提示缓存。"""
+    return (
+        f"你是 Minecraft 世界中的 AI 伙伴，名字叫 {companion_name}。"
+        "请用亲切、简洁的中文回答玩家，并在合适时提供实用的生存建议。"
+    )
+
 
 class ConversationHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
     ) -> str:
-        standard_message: Dict[str, Any] = CompactProtocol.parse(message)
+        standard_message: Dict[str, Any] = _parse_conversation_request(message)
 
-        player_name: str = str(standard_message.get("playerName") or "玩家")
+        player_name: str = str(
+            standard_message.get("playerName") or _DEFAULT_PLAYER_NAME
+        )
         player_message: str = str(standard_message.get("message", "") or "")
         message_id: str = str(standard_message.get("id", "") or "")
         companion_name: str = str(
-            standard_message.get("companionName", "AICompanion") or "AICompanion"
+            standard_message.get("companionName") or _DEFAULT_COMPANION_NAME
         )
 
-        system_prompt = (
-            f"你是 Minecraft 世界中的 AI 伙伴，名字叫 {companion_name}。"
-            "请用亲切、简洁的中文回答玩家，并在合适时提供实用的生存建议。"
+        system_prompt = _system_prompt(companion_name)
+        history_messages = context.conversation_context.get_llm_history(
+            context.client_id
         )
-        history_entries = context.conversation_context.get_history(context.client_id)
-        history_messages = [
-            {
-                "role": entry.get("role", "user"),
-                "content": str(entry.get("content", "")),
-            }
-            for entry in history_entries
-        ]
         current_user_message = {
             "role": "user",
             "content": f"[{player_name}] {player_message}",
@@ -53,8 +65,7 @@ class ConversationHandler(MessageHandler):
             current_user_message,
         ]
 
-        default_reply = "抱歉，我暂时无法响应，请稍后再试。"
-        reply: str = default_reply
+        reply: str = _DEFAULT_REPLY
 
         context.event_bus.publish(
             MonitorEventType.LLM_REQUEST,
@@ -79,6 +90,8 @@ class ConversationHandler(MessageHandler):
             llm_response = await context.llm_service.chat_completion(
                 messages=llm_messages, use_cache=False
             )
+            # LLM 返回后取一次时间戳，响应、发送事件共用
+            timestamp = datetime.now(timezone.utc).isoformat()
             choices = llm_response.get("choices", [])
             first_choice = choices[0] if choices else {}
             if isinstance(first_choice, dict):
@@ -87,7 +100,13 @@ class ConversationHandler(MessageHandler):
                 message_obj = {}
             llm_reply = message_obj.get("content", "")
             if isinstance(llm_reply, str):
-                reply = llm_reply.strip() or default_reply
+                # 回复通常首尾没有空白，只有需要时才 strip，避免复制整段长文本
+                if llm_reply and not (
+                    llm_reply[0].isspace() or llm_reply[-1].isspace()
+                ):
+                    reply = llm_reply
+                else:
+                    reply = llm_reply.strip() or _DEFAULT_REPLY
             else:
                 reply = str(llm_reply)
 
@@ -102,12 +121,13 @@ class ConversationHandler(MessageHandler):
                 {
                     "client_id": context.client_id,
                     "message_type": "conversation_response",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": timestamp,
                     "preview": reply[:200],
                     "usage": llm_response.get("usage"),
                 },
             )
         except Exception as exc:  # noqa: BLE001
+            timestamp = datetime.now(timezone.utc).isoformat()
             logger.exception(
                 "LLM 调用失败: client=%s, message=%s", context.client_id, message_id
             )
@@ -116,7 +136,7 @@ class ConversationHandler(MessageHandler):
                 {
                     "client_id": context.client_id,
                     "message_type": "conversation_request",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": timestamp,
                     "error": str(exc),
                 },
             )
@@ -135,9 +155,10 @@ class ConversationHandler(MessageHandler):
 
         compact_response: Dict[str, Any] = CompactProtocol.compact(standard_response)
 
-        stats: Dict[str, Any] = TokenTracker.compare(
-            standard_response, compact_response
-        )
+        # 标准格式的 JSON 文本既用于统计也直接下发，只编码一次
+        payload = orjson.dumps(standard_response, option=ORJSON_OPTIONS).decode()
+        compact_json = orjson.dumps(compact_response, option=ORJSON_OPTIONS).decode()
+        stats: Dict[str, Any] = TokenTracker.compare_serialized(payload, compact_json)
         stats["client_id"] = context.client_id
         stats["message_type"] = "conversation"
 
@@ -146,13 +167,13 @@ class ConversationHandler(MessageHandler):
 
         context.event_bus.publish(MonitorEventType.TOKEN_STATS, stats)
         context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
+            _MESSAGE_SENT,
             {
                 "client_id": context.client_id,
                 "message_type": "conversation_response",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp,
             },
         )
 
-        await websocket.send_json(standard_response)
-        return json.dumps(standard_response)
+        await websocket.send_text(payload)
+        return payload
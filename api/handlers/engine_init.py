@@ -3,15 +3,12 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
 from typing import Any, Dict
 
-import orjson
 from fastapi import WebSocket
 
-from api.handlers.base import MessageHandler
+from api.handlers.base import MessageHandler, record_send, send_payload
 from api.handlers.context import HandlerContext
-from core.monitor.event_types import MonitorEventType
 
 logger = logging.getLogger("api.handlers.engine_init")
 
@@ -22,13 +19,16 @@ class EngineInitHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
     ) -> str:
-        session_id = str(message.get("session_id") or message.get("sessionId") or "")
-        character_id = str(
-            message.get("character_id") or message.get("characterId") or ""
+        # JSON 解析出的字段几乎总是 str，仅在非 str 时才转换
+        raw_session_id = message.get("session_id") or ""
+        session_id = (
+            raw_session_id if type(raw_session_id) is str else str(raw_session_id)
         )
-        character_card = (
-            message.get("character_card") or message.get("characterCard") or {}
+        raw_character_id = message.get("character_id") or ""
+        character_id = (
+            raw_character_id if type(raw_character_id) is str else str(raw_character_id)
         )
+        character_card = message.get("character_card") or {}
         config = message.get("config") or {}
 
         engine_manager = context.engine_manager
@@ -38,9 +38,8 @@ class EngineInitHandler(MessageHandler):
                 "code": "engine_disabled",
                 "message": "引擎功能未启用",
             }
-            serialized = orjson.dumps(payload).decode("utf-8")
-            await websocket.send_text(serialized)
-            self._record_send(context, payload["type"])
+            serialized = await send_payload(websocket, payload)
+            record_send(context, payload["type"])
             return serialized
 
         try:
@@ -54,9 +53,8 @@ class EngineInitHandler(MessageHandler):
                 "type": "engine_ready",
                 "session_id": session.session_id,
             }
-            serialized = orjson.dumps(response).decode("utf-8")
-            await websocket.send_text(serialized)
-            self._record_send(context, response["type"])
+            serialized = await send_payload(websocket, response)
+            record_send(context, response["type"])
             return serialized
         except Exception as exc:  # noqa: BLE001
             logger.exception(
@@ -67,19 +65,6 @@ class EngineInitHandler(MessageHandler):
                 "code": "init_failed",
                 "message": str(exc),
             }
-            serialized = orjson.dumps(payload).decode("utf-8")
-            await websocket.send_text(serialized)
-            self._record_send(context, payload["type"])
+            serialized = await send_payload(websocket, payload)
+            record_send(context, payload["type"])
             return serialized
-
-    def _record_send(self, context: HandlerContext, message_type: str) -> None:
-        """记录监控事件与指标。"""
-        context.metrics.record_message_sent(message_type)
-        context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
-            {
-                "client_id": context.client_id,
-                "message_type": message_type,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            },
-        )
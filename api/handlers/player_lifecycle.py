@@ -2,25 +2,28 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 from fastapi import WebSocket
 
-from api.handlers.base import MessageHandler
+from api.handlers.base import MessageHandler, send_payload
 from api.handlers.context import HandlerContext
 from core.monitor.event_types import MonitorEventType
 
 logger = logging.getLogger("api.handlers.player_lifecycle")
 
+_MESSAGE_SENT = MonitorEventType.MESSAGE_SENT
+
+_DEFAULT_PLAYER_NAME = "玩家"
+
 
 class PlayerConnectedHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
     ) -> str:
-        player_name = str(message.get("playerName") or "玩家")
+        player_name = str(message.get("playerName") or _DEFAULT_PLAYER_NAME)
         session = context.conversation_context.create_session(
             context.client_id, player_name
         )
@@ -34,27 +37,27 @@ class PlayerConnectedHandler(MessageHandler):
             "type": "player_connected_ack",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "playerName": player_name,
-            "sessionStartedAt": session.started_at.isoformat(),
+            "sessionStartedAt": session.started_at,
         }
-        await websocket.send_json(response)
+        payload = await send_payload(websocket, response)
 
         context.metrics.record_message_sent("player_connected_ack")
         context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
+            _MESSAGE_SENT,
             {
                 "client_id": context.client_id,
                 "message_type": "player_connected_ack",
                 "timestamp": response["timestamp"],
             },
         )
-        return json.dumps(response)
+        return payload
 
 
 class PlayerDisconnectedHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
     ) -> str:
-        player_name = str(message.get("playerName") or "玩家")
+        player_name = str(message.get("playerName") or _DEFAULT_PLAYER_NAME)
         context.conversation_context.clear_session(context.client_id)
         logger.info(
             "玩家离开世界，已清空会话: client=%s, player=%s",
@@ -67,15 +70,15 @@ class PlayerDisconnectedHandler(MessageHandler):
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "playerName": player_name,
         }
-        await websocket.send_json(response)
+        payload = await send_payload(websocket, response)
 
         context.metrics.record_message_sent("player_disconnected_ack")
         context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
+            _MESSAGE_SENT,
             {
                 "client_id": context.client_id,
                 "message_type": "player_disconnected_ack",
                 "timestamp": response["timestamp"],
             },
         )
-        return json.dumps(response)
+        return payload
@@ -1,5 +1,14 @@
-"""消息处理器注册表。"""
+"""消息处理器注册表。
 
+分发保持单次字典查找：match/case 对字符串字面量会编译成逐个比较，
+并不比哈希查找更快。注册表在导入时即冻结为只读映射，
+热路径直接调用 MESSAGE_HANDLERS.get，不再经过 get_handler 包装。
+"""
+
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from api.handlers.base import MessageHandler
 from api.handlers.connection import ConnectionInitHandler
 from api.handlers.conversation import ConversationHandler
 from api.handlers.engine_init import EngineInitHandler
@@ -11,18 +20,20 @@ from api.handlers.player_lifecycle import (
 from api.handlers.player_message import PlayerMessageHandler
 from api.handlers.world_diff import WorldDiffHandler
 
-MESSAGE_HANDLERS = {
-    "connection_init": ConnectionInitHandler(),
-    "game_state_update": GameStateHandler(),
-    "conversation_request": ConversationHandler(),
-    "player_connected": PlayerConnectedHandler(),
-    "player_disconnected": PlayerDisconnectedHandler(),
-    "engine_init": EngineInitHandler(),
-    "world_diff": WorldDiffHandler(),
-    "player_message": PlayerMessageHandler(),
-}
+MESSAGE_HANDLERS: Mapping[str, MessageHandler] = MappingProxyType(
+    {
+        "connection_init": ConnectionInitHandler(),
+        "game_state_update": GameStateHandler(),
+        "conversation_request": ConversationHandler(),
+        "player_connected": PlayerConnectedHandler(),
+        "player_disconnected": PlayerDisconnectedHandler(),
+        "engine_init": EngineInitHandler(),
+        "world_diff": WorldDiffHandler(),
+        "player_message": PlayerMessageHandler(),
+    }
+)
 
 
-def get_handler(message_type: str):
+def get_handler(message_type: str) -> Optional[MessageHandler]:
     """根据消息类型获取处理器。"""
     return MESSAGE_HANDLERS.get(message_type)
@@ -3,16 +3,17 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, cast
+from typing import Any, Dict
 
-import orjson
 from fastapi import WebSocket
 
-from api.handlers.base import MessageHandler
+from api.handlers.base import (
+    MessageHandler,
+    record_send,
+    send_engine_outputs,
+    send_payload,
+)
 from api.handlers.context import HandlerContext
-from core.interfaces import EngineSessionInterface
-from core.monitor.event_types import MonitorEventType
 
 logger = logging.getLogger("api.handlers.world_diff")
 
@@ -23,7 +24,11 @@ class WorldDiffHandler(MessageHandler):
     async def handle(
         self, websocket: WebSocket, message: Dict[str, Any], context: HandlerContext
     ) -> str:
-        session_id = str(message.get("session_id") or message.get("sessionId") or "")
+        # JSON 解析出的字段几乎总是 str，仅在非 str 时才转换
+        raw_session_id = message.get("session_id") or ""
+        session_id = (
+            raw_session_id if type(raw_session_id) is str else str(raw_session_id)
+        )
         diff = message.get("data") or {}
 
         engine_manager = context.engine_manager
@@ -44,9 +49,6 @@ class WorldDiffHandler(MessageHandler):
                 "未找到对应会话",
             )
 
-        # Type assertion for Protocol type narrowing
-        session = cast(EngineSessionInterface, session)
-
         runtime = getattr(engine_manager, "runtime", None)
         vision_store = getattr(engine_manager, "vision_store", None)
         story_store = getattr(engine_manager, "story_store", None)
@@ -75,18 +77,7 @@ class WorldDiffHandler(MessageHandler):
                 str(exc),
             )
 
-        previews: List[str] = []
-        for output in outputs:
-            msg_type = str(output.get("type", "unknown"))
-            payload = {**output}
-            payload.setdefault("session_id", session_id)
-
-            serialized = orjson.dumps(payload).decode("utf-8")
-            await websocket.send_text(serialized)
-            self._record_send(context, msg_type)
-            previews.append(serialized)
-
-        return previews[-1] if previews else ""
+        return await send_engine_outputs(websocket, context, session_id, outputs)
 
     async def _send_error(
         self,
@@ -101,19 +92,6 @@ class WorldDiffHandler(MessageHandler):
             "code": code,
             "message": message,
         }
-        serialized = orjson.dumps(payload).decode("utf-8")
-        await websocket.send_text(serialized)
-        self._record_send(context, payload["type"])
+        serialized = await send_payload(websocket, payload)
+        record_send(context, payload["type"])
         return serialized
-
-    def _record_send(self, context: HandlerContext, message_type: str) -> None:
-        """记录监控事件与指标。"""
-        context.metrics.record_message_sent(message_type)
-        context.event_bus.publish(
-            MonitorEventType.MESSAGE_SENT,
-            {
-                "client_id": context.client_id,
-                "message_type": message_type,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            },
-        )
@@ -1,27 +1,60 @@
 """监控 WebSocket 端点，用于将事件推送至前端"""
 
 import asyncio
-import json
+import contextlib
 import logging
-from typing import Dict, Set
-from uuid import uuid4
+import threading
+from secrets import token_hex
+from typing import Any, Collection, Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from api.rate_limiter import WebSocketRateLimiter
-from api.validation import MonitorCommand
 from core.dependencies import EventBusDep, MetricsDep
 from core.monitor.event_types import MonitorEventType
 
 router = APIRouter()
 logger = logging.getLogger("api.monitor_ws")
 
-# 活跃监控客户端集合，避免重复推送
-active_monitor_clients: Set[WebSocket] = set()
+# 活跃监控客户端列表（写时复制：增删时整体替换，广播直接遍历当前引用，无需拷贝）
+active_monitor_clients: List[WebSocket] = []
 
 # 监控 WebSocket 速率限制器（每分钟最多 30 条命令）
 monitor_rate_limiter = WebSocketRateLimiter(max_messages=30, window_seconds=60)
 
+# 单批并发推送的客户端数量，批次之间让出事件循环
+BROADCAST_BATCH_SIZE = 50
+
+# 待广播事件队列上限，监控端处理不过来时丢弃新事件而非无限堆积
+BROADCAST_QUEUE_SIZE = 10000
+
+# 订阅的事件类型在导入时固定下来，注册时直接遍历元组
+_EVENT_TYPES: Tuple[MonitorEventType, ...] = tuple(MonitorEventType)
+
+# 监控端仅支持的命令类型（与 api.validation.MonitorCommand 保持一致）
+_MONITOR_COMMANDS = frozenset({"clear_history", "reset_stats"})
+
+
+def _encode(payload: Any) -> str:
+    """使用 orjson 编码为文本帧内容（前端按文本帧 JSON.parse）。"""
+    return orjson.dumps(payload).decode("utf-8")
+
+
+# 内容固定的回复帧在导入时编码一次，发送时直接复用字符串
+_RATE_LIMITED_FRAME = _encode(
+    {"type": "error", "message": "命令发送过快，请稍后再试（限制：30条/分钟）"}
+)
+_INVALID_FORMAT_FRAME = _encode({"type": "error", "message": "无效指令格式"})
+_INVALID_COMMAND_FRAME = _encode(
+    {
+        "type": "error",
+        "message": f"无效的命令: type 必须是 {sorted(_MONITOR_COMMANDS)} 之一",
+    }
+)
+_HISTORY_CLEARED_FRAME = _encode({"type": "ack", "message": "历史记录已清除"})
+_STATS_RESET_FRAME = _encode({"type": "ack", "message": "统计数据已重置"})
+
 
 @router.websocket("/ws/monitor")
 async def monitor_websocket(
@@ -34,9 +67,11 @@ async def monitor_websocket(
     实时推送监控事件到前端
     """
 
+    global active_monitor_clients
+
     await websocket.accept()
-    client_id = f"monitor-{uuid4()}"
-    active_monitor_clients.add(websocket)
+    client_id = f"monitor-{token_hex(8)}"
+    active_monitor_clients = [*active_monitor_clients, websocket]
 
     # 控制台提示连接状态
     logger.info("[OK] Monitor client connected: %s", client_id)
@@ -46,19 +81,18 @@ async def monitor_websocket(
 
     # 发送历史事件，方便前端初始化状态
     history = event_bus.get_recent_events(limit=50)
-    await websocket.send_json({"type": "history", "events": history})
+    await websocket.send_text(_encode({"type": "history", "events": history}))
 
     # 发送当前统计信息，确保前端展示一致
     stats = metrics.get_stats()
     connection_status = metrics.get_connection_status()
-    await websocket.send_json(
-        {
-            "type": "stats",
-            "data": {
-                "stats": stats.model_dump(mode="json"),
-                "connection_status": connection_status.model_dump(mode="json"),
-            },
-        }
+    # 模型直接由 Pydantic 序列化为 JSON，外层信封用字符串拼接，不经过中间字典
+    await websocket.send_text(
+        '{"type":"stats","data":{"stats":'
+        + stats.model_dump_json()
+        + ',"connection_status":'
+        + connection_status.model_dump_json()
+        + "}}"
     )
 
     try:
@@ -68,36 +102,30 @@ async def monitor_websocket(
 
             # 检查速率限制
             if not monitor_rate_limiter.check_rate_limit(client_id):
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": "命令发送过快，请稍后再试（限制：30条/分钟）",
-                    }
-                )
+                await websocket.send_text(_RATE_LIMITED_FRAME)
                 continue
 
             try:
-                command_dict = json.loads(data)
-                # 使用 Pydantic 验证命令
-                validated_cmd = MonitorCommand(**command_dict)
-                command_type = validated_cmd.type
-            except json.JSONDecodeError:
-                await websocket.send_json({"type": "error", "message": "无效指令格式"})
+                command_dict = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                await websocket.send_text(_INVALID_FORMAT_FRAME)
                 continue
-            except Exception as e:
-                # Pydantic 验证失败
-                await websocket.send_json(
-                    {"type": "error", "message": f"无效的命令: {str(e)}"}
-                )
+
+            # 命令只有一个 type 字段，手写校验即可，无需构造 Pydantic 模型
+            command_type = (
+                command_dict.get("type") if isinstance(command_dict, dict) else None
+            )
+            if command_type not in _MONITOR_COMMANDS:
+                await websocket.send_text(_INVALID_COMMAND_FRAME)
                 continue
 
             # 根据指令类型执行不同管理操作
             if command_type == "clear_history":
                 event_bus.clear_history()
-                await websocket.send_json({"type": "ack", "message": "历史记录已清除"})
+                await websocket.send_text(_HISTORY_CLEARED_FRAME)
             elif command_type == "reset_stats":
                 metrics.reset_stats()
-                await websocket.send_json({"type": "ack", "message": "统计数据已重置"})
+                await websocket.send_text(_STATS_RESET_FRAME)
 
     except WebSocketDisconnect:
         logger.warning("[ERR] Monitor client disconnected: %s", client_id)
@@ -107,32 +135,102 @@ async def monitor_websocket(
     finally:
         # 清理客户端状态并通知事件总线
         monitor_rate_limiter.clear(client_id)
-        active_monitor_clients.discard(websocket)
+        _remove_monitor_clients((websocket,))
         event_bus.publish(
             MonitorEventType.FRONTEND_DISCONNECTED, {"client_id": client_id}
         )
 
 
+def _remove_monitor_clients(clients: Collection[WebSocket]) -> None:
+    """从活跃列表中移除给定客户端（替换为新列表，不影响进行中的广播）"""
+    global active_monitor_clients
+    active_monitor_clients = [c for c in active_monitor_clients if c not in clients]
+
+
 async def broadcast_event_to_monitors(event: Dict) -> None:
     """广播事件到所有监控客户端"""
-    disconnected: Set[WebSocket] = set()
+    # 列表只会被整体替换，持有当前引用即为稳定快照
+    clients = active_monitor_clients
+    if not clients:
+        return
+
+    # 同一事件只编码一次，所有客户端共享同一份文本并发发送
+    message = _encode({"type": "event", "event": event})
+    for start in range(0, len(clients), BROADCAST_BATCH_SIZE):
+        batch = clients[start : start + BROADCAST_BATCH_SIZE]
+        results = await asyncio.gather(
+            *(client.send_text(message) for client in batch), return_exceptions=True
+        )
+
+        # 清理断开连接的客户端，防止列表膨胀
+        failed = [c for c, r in zip(batch, results) if isinstance(r, Exception)]
+        if failed:
+            _remove_monitor_clients(failed)
+
+        # 客户端较多时分批让出事件循环，避免一次广播阻塞其他请求
+        if start + BROADCAST_BATCH_SIZE < len(clients):
+            await asyncio.sleep(0)
+
+
+class MonitorBroadcaster:
+    """事件总线 → 队列 → 单个常驻广播任务的桥接器。
 
-    # 向所有在线监控客户端推送事件
-    for client in list(active_monitor_clients):
+    事件回调只把事件放入有界队列，不再为每个事件创建 Task；
+    从其他线程发布的事件通过 call_soon_threadsafe 交回事件循环。
+    """
+
+    def __init__(self, maxsize: int = BROADCAST_QUEUE_SIZE) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """在当前事件循环中启动广播任务。"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止广播任务，未发送的事件直接丢弃。"""
+        task, self._task = self._task, None
+        self._loop = None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def enqueue(self, event: Dict[str, Any]) -> None:
+        """事件总线回调：把事件交给广播任务。"""
+        loop = self._loop
+        # 未启动或没有监控端时无需排队，连接时会通过历史记录补齐
+        if loop is None or not active_monitor_clients:
+            return
+        if threading.get_ident() == self._loop_thread:
+            self._put(event)
+        else:
+            loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Dict[str, Any]) -> None:
         try:
-            await client.send_json({"type": "event", "event": event})
-        except Exception:
-            disconnected.add(client)
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("监控广播队列已满，丢弃事件: %s", event.get("type"))
 
-    # 清理断开连接的客户端，防止集合膨胀
-    for client in disconnected:
-        active_monitor_clients.discard(client)
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                await broadcast_event_to_monitors(event)
+            except Exception as exc:  # noqa: BLE001
+                # 单个事件失败不应终止常驻任务
+                logger.error("[ERR] Monitor broadcast failed: %s", exc)
 
 
-def register_monitor_subscriptions(event_bus) -> None:
+def register_monitor_subscriptions(event_bus, broadcaster: MonitorBroadcaster) -> None:
     """在应用启动时注册事件总线订阅，将事件转发给前端监控连接。"""
-    for event_type in MonitorEventType:
-        event_bus.subscribe(
-            event_type,
-            lambda event: asyncio.create_task(broadcast_event_to_monitors(event)),
-        )
+    # 所有类型共用同一个回调对象（绑定方法每次取属性都会新建）
+    callback = broadcaster.enqueue
+    for event_type in _EVENT_TYPES:
+        event_bus.subscribe(event_type, callback)
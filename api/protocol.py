@@ -6,7 +6,7 @@
 # pyright: reportArgumentType=false
 
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, FrozenSet, Tuple
 
 
 class CompactProtocol:
@@ -59,21 +59,32 @@ class CompactProtocol:
         "id": "id",
         "timestamp": "timestamp",
         "type": "type",
+        # 引擎消息字段统一为蛇形，处理器只需查一个键
+        "sessionId": "session_id",
+        "characterId": "character_id",
+        "characterCard": "character_card",
+        "playerId": "player_id",
     }
 
-    @classmethod
-    def _expand_type(cls, value: Any) -> Any:
-        """将类型值从短码展开为长字符串；若已为长字符串则原样返回。"""
-        if isinstance(value, str) and value in cls.TYPE_MAP:
-            return cls.TYPE_MAP[value]
-        return value
-
-    @classmethod
-    def _compact_type(cls, value: Any) -> Any:
-        """将类型值从长字符串压缩为短码；若无对应短码则原样返回。"""
-        if isinstance(value, str) and value in cls._TYPE_LONG_TO_SHORT:
-            return cls._TYPE_LONG_TO_SHORT[value]
-        return value
+    # 合并后的键名映射（短键优先于别名），parse 每个字段只需一次查找
+    _NORMALIZE_MAP: Dict[str, str] = {**FIELD_ALIASES, **SHORT_TO_LONG}
+
+    # 需要改名的键；输入不含这些键时 parse 可直接走快速路径
+    _RENAMED_KEYS: FrozenSet[str] = frozenset(
+        key for key, value in _NORMALIZE_MAP.items() if key != value
+    )
+
+    # 已知消息的字段清单，供 build_specialized 生成专用解析函数
+    SCHEMAS: Dict[str, Tuple[str, ...]] = {
+        "conversation_request": (
+            "id",
+            "type",
+            "timestamp",
+            "playerName",
+            "companionName",
+            "message",
+        ),
+    }
 
     @classmethod
     def parse(cls, compact_msg: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,42 +100,88 @@ class CompactProtocol:
         if not isinstance(compact_msg, dict):
             raise ValueError("parse 期望 dict 输入")
 
-        src: Dict[str, Any] = dict(compact_msg)
-        result: Dict[str, Any] = {}
-
-        def _normalize_key(key: str) -> str:
-            if key in cls.SHORT_TO_LONG:
-                return cls.SHORT_TO_LONG[key]
-            if key in cls.FIELD_ALIASES:
-                return cls.FIELD_ALIASES[key]
-            return key
+        # 0) 已是标准格式（无 data、无需改名、type 非短码）时直接浅拷贝返回
+        msg_type = compact_msg.get("type")
+        if (
+            "data" not in compact_msg
+            and cls._RENAMED_KEYS.isdisjoint(compact_msg.keys())
+            and not (isinstance(msg_type, str) and msg_type in cls.TYPE_MAP)
+        ):
+            return dict(compact_msg)
 
-        def _assign(long_key: str, raw_value: Any) -> None:
-            if long_key == "type":
-                result[long_key] = cls._expand_type(raw_value)
-            else:
-                result[long_key] = raw_value
+        normalize = cls._NORMALIZE_MAP
+        result: Dict[str, Any] = {}
 
         # 1) 处理旧版 data 嵌套，优先填充基础字段
-        data_obj = src.get("data")
+        data_obj = compact_msg.get("data")
         if isinstance(data_obj, dict):
             for key, value in data_obj.items():
-                long_key = _normalize_key(key)
-                _assign(long_key, value)
+                result[normalize.get(key, key)] = value
 
         # 2) 覆盖/补充顶层字段（紧凑键、长键、别名均可）
-        for key, value in src.items():
-            if key == "data":
-                continue
-            long_key = _normalize_key(key)
-            _assign(long_key, value)
+        for key, value in compact_msg.items():
+            if key != "data":
+                result[normalize.get(key, key)] = value
 
-        # 3) 确保 type 已展开（兜底处理短码）
-        if "type" in result:
-            result["type"] = cls._expand_type(result["type"])
+        # 3) 展开 type 短码
+        msg_type = result.get("type")
+        if isinstance(msg_type, str):
+            result["type"] = cls.TYPE_MAP.get(msg_type, msg_type)
 
         return result
 
+    @classmethod
+    def build_specialized(
+        cls, schema_name: str
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """为已知消息生成专用解析函数。
+
+        结果与 ``parse`` 对该消息的字段一致，但只查找清单内字段：
+        每个标准字段的候选键（长键、短键、别名）在构建时一次性算好，
+        解析时按“顶层优先、data 兜底”直接取值，不再遍历整个字典。
+        清单外的字段不会出现在返回值中。
+        """
+        fields = cls.SCHEMAS[schema_name]
+        plan: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (
+                long_key,
+                (long_key,)
+                + tuple(
+                    key
+                    for key, target in cls._NORMALIZE_MAP.items()
+                    if target == long_key and key != long_key
+                ),
+            )
+            for long_key in fields
+        )
+        type_map = cls.TYPE_MAP
+
+        def parse_specialized(compact_msg: Dict[str, Any]) -> Dict[str, Any]:
+            if not isinstance(compact_msg, dict):
+                raise ValueError("parse 期望 dict 输入")
+
+            data_obj = compact_msg.get("data")
+            layers = (
+                (compact_msg, data_obj) if isinstance(data_obj, dict) else (compact_msg,)
+            )
+            result: Dict[str, Any] = {}
+            for long_key, keys in plan:
+                for layer in layers:
+                    for key in keys:
+                        if key in layer:
+                            result[long_key] = layer[key]
+                            break
+                    else:
+                        continue
+                    break
+
+            msg_type = result.get("type")
+            if isinstance(msg_type, str):
+                result["type"] = type_map.get(msg_type, msg_type)
+            return result
+
+        return parse_specialized
+
     @classmethod
     def compact(cls, standard_msg: Dict[str, Any]) -> Dict[str, Any]:
         """内部标准格式 → 紧凑格式。
@@ -135,18 +192,14 @@ class CompactProtocol:
         if not isinstance(standard_msg, dict):
             raise ValueError("compact 期望 dict 输入")
 
+        long_to_short = cls._LONG_TO_SHORT
         dest: Dict[str, Any] = {}
         for key, value in standard_msg.items():
-            if key == "type":
-                dest_key = cls._LONG_TO_SHORT.get(key, key)
-                dest[dest_key] = cls._compact_type(value)
-                continue
-
-            short_key = cls._LONG_TO_SHORT.get(key)
-            if short_key is not None:
-                dest[short_key] = value
-            else:
-                # 未知字段：保持原名避免数据丢失
-                dest[key] = value
+            # 未知字段：保持原名避免数据丢失
+            dest[long_to_short.get(key, key)] = value
+
+        msg_type = standard_msg.get("type")
+        if isinstance(msg_type, str):
+            dest[long_to_short["type"]] = cls._TYPE_LONG_TO_SHORT.get(msg_type, msg_type)
 
         return dest
@@ -1,15 +1,14 @@
 """WebSocket 速率限制器"""
 
-from collections import defaultdict, deque
-from datetime import datetime, timedelta, timezone
-from typing import Dict
+import time
+from typing import Dict, Tuple
 
 
 class WebSocketRateLimiter:
     """
     WebSocket 连接速率限制器
 
-    使用滑动窗口算法限制消息发送频率，防止:
+    使用令牌桶算法限制消息发送频率，防止:
     - DoS 攻击
     - 资源耗尽
     - 意外的消息洪水
@@ -20,12 +19,23 @@ class WebSocketRateLimiter:
         初始化速率限制器
 
         Args:
-            max_messages: 时间窗口内最大允许的消息数
+            max_messages: 时间窗口内最大允许的消息数（即令牌桶容量）
             window_seconds: 时间窗口大小（秒）
         """
         self.max_messages = max_messages
-        self.window = timedelta(seconds=window_seconds)
-        self.message_times: Dict[str, deque] = defaultdict(deque)
+        self.window_seconds = window_seconds
+        # 每秒补充的令牌数，桶容量即 max_messages
+        self.rate = max_messages / window_seconds
+        # client_id -> (剩余令牌, 上次补充时间)，每个客户端只占两个浮点数
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _refill(self, client_id: str, now: float) -> float:
+        """按距上次补充的时间惰性补充令牌，返回当前令牌数"""
+        bucket = self.buckets.get(client_id)
+        if bucket is None:
+            return float(self.max_messages)
+        tokens, last = bucket
+        return min(self.max_messages, tokens + (now - last) * self.rate)
 
     def check_rate_limit(self, client_id: str) -> bool:
         """
@@ -37,21 +47,15 @@ class WebSocketRateLimiter:
         Returns:
             True 如果未超限，False 如果已超限
         """
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
+        tokens = self._refill(client_id, now)
 
-        # 清理超出时间窗口的旧记录
-        while (
-            self.message_times[client_id]
-            and now - self.message_times[client_id][0] > self.window
-        ):
-            self.message_times[client_id].popleft()
-
-        # 检查是否超过限制
-        if len(self.message_times[client_id]) >= self.max_messages:
+        # 令牌不足则拒绝，但仍记录补充进度
+        if tokens < 1:
+            self.buckets[client_id] = (tokens, now)
             return False
 
-        # 记录本次消息时间
-        self.message_times[client_id].append(now)
+        self.buckets[client_id] = (tokens - 1, now)
         return True
 
     def clear(self, client_id: str) -> None:
@@ -61,7 +65,7 @@ class WebSocketRateLimiter:
         Args:
             client_id: 客户端唯一标识
         """
-        self.message_times.pop(client_id, None)
+        self.buckets.pop(client_id, None)
 
     def get_remaining_quota(self, client_id: str) -> int:
         """
@@ -73,14 +77,4 @@ class WebSocketRateLimiter:
         Returns:
             剩余可发送的消息数量
         """
-        now = datetime.now(timezone.utc)
-
-        # 清理过期记录
-        while (
-            self.message_times[client_id]
-            and now - self.message_times[client_id][0] > self.window
-        ):
-            self.message_times[client_id].popleft()
-
-        used = len(self.message_times[client_id])
-        return max(0, self.max_messages - used)
+        return int(self._refill(client_id, time.monotonic()))
@@ -0,0 +1,20 @@
+"""自定义 HTTP 响应类。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """使用 orjson 编码的 JSON 响应。
+
+    路由直接返回该响应时，FastAPI 不再经过 jsonable_encoder 与标准库 json。
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
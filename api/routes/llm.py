@@ -3,21 +3,29 @@
 该路由接收玩家消息，通过 LLMService 调用真实大模型，并返回响应。
 """
 
-import json
+import asyncio
 import logging
+from functools import lru_cache
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from pydantic import BaseModel, ConfigDict, Field
 
-from api.protocol import CompactProtocol
+from api.responses import ORJSONResponse
 from core.dependencies import LLMDep
 
 logger = logging.getLogger("api.routes.llm")
 
 router = APIRouter(prefix="/api/llm", tags=["LLM"])
 
+SETTINGS_PATH = Path("config/settings.json")
+
+# 串行化配置快照的修改与落盘，避免并发保存互相覆盖临时文件
+_settings_lock = asyncio.Lock()
+
 
 def _mask_api_key(api_key: Optional[str]) -> str:
     """日志中隐藏 API Key，仅展示前 8 位。"""
@@ -26,6 +34,79 @@ def _mask_api_key(api_key: Optional[str]) -> str:
     return f"{api_key[:8]}***"
 
 
+def _settings_mtime_ns(path: Path) -> Optional[int]:
+    """返回配置文件的修改时间（纳秒），文件不存在时返回 None。"""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_settings(path: Path) -> Tuple[Optional[int], Dict[str, Any]]:
+    """读取 settings.json 及其修改时间，文件不存在时返回空配置。
+
+    内容不是合法的 JSON 对象时抛出 ValueError：保存会因此失败，
+    而不是用只含 llm 段的新配置覆盖掉原文件里的其他配置。
+    """
+    mtime_ns = _settings_mtime_ns(path)
+    if mtime_ns is None:
+        return None, {}
+    with open(path, "rb") as file:
+        raw = file.read()
+    try:
+        loaded = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
+        raise ValueError(f"{path} 不是合法 JSON: {exc}") from exc
+    if not isinstance(loaded, dict):
+        raise ValueError(f"{path} 顶层必须是 JSON 对象")
+    return mtime_ns, loaded
+
+
+def _atomic_write(path: Path, data: bytes) -> int:
+    """先写临时文件再原子替换，避免写到一半时留下损坏的配置。
+
+    返回替换后文件的修改时间（纳秒）。
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+    return path.stat().st_mtime_ns
+
+
+async def load_settings_snapshot(app: FastAPI) -> None:
+    """启动时在线程中加载配置快照；文件非法时只记录警告，保存时再报错。"""
+    try:
+        mtime_ns, snapshot = await asyncio.to_thread(_read_settings, SETTINGS_PATH)
+    except (OSError, ValueError) as exc:
+        logger.warning("加载 settings.json 失败，暂不缓存配置快照: %s", exc)
+        return
+    app.state.settings = snapshot
+    app.state.settings_mtime_ns = mtime_ns
+
+
+async def _get_settings_snapshot(app: FastAPI) -> Dict[str, Any]:
+    """返回内存中的配置快照。
+
+    每次只在线程中 stat 一次文件；快照缺失或文件被外部修改过（修改时间变化）
+    时才重新读取，避免用过期快照覆盖手工改动。
+    """
+    snapshot = getattr(app.state, "settings", None)
+    mtime_ns = await asyncio.to_thread(_settings_mtime_ns, SETTINGS_PATH)
+    if snapshot is None or mtime_ns != getattr(app.state, "settings_mtime_ns", None):
+        mtime_ns, snapshot = await asyncio.to_thread(_read_settings, SETTINGS_PATH)
+        app.state.settings = snapshot
+        app.state.settings_mtime_ns = mtime_ns
+    return snapshot
+
+
+@lru_cache(maxsize=64)
+def _system_prompt(companion_name: str) -> str:
+    """按伙伴名缓存系统提示词，避免每次请求重新拼接。"""
+    return f"你是一个 Minecraft 游戏中的 AI 伙伴。你的名字叫 {companion_name}。"
+
+
 class ActionCommand(BaseModel):
     """玩家指令动作。"""
 
@@ -69,27 +150,31 @@ class LLMConfigRequest(BaseModel):
 @router.post("/player")
 async def handle_player_request(
     payload: ConversationRequest, llm: LLMDep
-) -> Dict[str, Any]:
-    """接收玩家消息，压缩为紧凑协议并调用真实 LLM 服务。"""
-
-    standard_request: Dict[str, Any] = payload.model_dump(
-        by_alias=True, exclude_none=True
-    )
-    masked_payload = standard_request.copy()
-    llm_config_log = standard_request.get("llmConfig")
-    if llm_config_log:
-        masked_payload["llmConfig"] = llm_config_log.copy()
-        if llm_config_log.get("apiKey"):
-            masked_payload["llmConfig"]["apiKey"] = _mask_api_key(
-                llm_config_log.get("apiKey")
-            )
-    logger.info("收到玩家 LLM 请求: payload=%s", masked_payload)
+) -> ORJSONResponse:
+    """接收玩家消息并调用真实 LLM 服务。"""
+
+    # 仅在 INFO 开启时构造日志内容；llmConfig 单独脱敏后附加
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        llm_config_log = payload.llmConfig
+        if llm_config_log and llm_config_log.get("apiKey"):
+            llm_config_log = {
+                **llm_config_log,
+                "apiKey": _mask_api_key(llm_config_log["apiKey"]),
+            }
+        logger.info(
+            "收到玩家 LLM 请求: payload=%s, llmConfig=%s",
+            payload.model_dump_json(exclude={"llmConfig"}, exclude_none=True),
+            llm_config_log,
+        )
 
     try:
         # 如果前端提供了 LLM 配置，则覆盖后端默认配置
         if payload.llmConfig:
             logger.info(
-                f"使用前端提供的 LLM 配置: provider={payload.llmConfig.get('provider')}, model={payload.llmConfig.get('model')}"
+                "使用前端提供的 LLM 配置: provider=%s, model=%s",
+                payload.llmConfig.get("provider"),
+                payload.llmConfig.get("model"),
             )
             llm.config["provider"] = payload.llmConfig.get(
                 "provider", llm.config["provider"]
@@ -108,14 +193,14 @@ async def handle_player_request(
             raise HTTPException(status_code=400, detail="API Key 未配置")
 
         # 1. 构造 Prompt
-        player_name = standard_request.get("playerName", "Player")
-        message_content = standard_request.get("message", "")
+        player_name = payload.playerName
+        message_content = payload.message or ""
 
         # 简单的 Prompt 构造 (后续可移至 core/personality)
         messages = [
             {
                 "role": "system",
-                "content": f"你是一个 Minecraft 游戏中的 AI 伙伴。你的名字叫 {standard_request.get('companionName', 'AI')}。",
+                "content": _system_prompt(payload.companionName or "AI"),
             },
             {"role": "user", "content": f"[{player_name}]: {message_content}"},
         ]
@@ -126,11 +211,13 @@ async def handle_player_request(
 
         # 3. 解析响应
         llm_reply = response["choices"][0]["message"]["content"]
-        try:
-            response_preview = json.dumps(response, ensure_ascii=False)
-        except TypeError:
-            response_preview = str(response)
-        logger.info("LLM 原始响应（前 200 字符）: %s", response_preview[:200])
+        if log_info:
+            # 完整响应可能很长，日志关闭时跳过序列化
+            try:
+                response_preview = orjson.dumps(response).decode("utf-8")[:200]
+            except TypeError:
+                response_preview = str(response)[:200]
+            logger.info("LLM 原始响应（前 200 字符）: %s", response_preview)
 
         # 4. 构造标准响应
         standard_response: Dict[str, Any] = {
@@ -141,12 +228,9 @@ async def handle_player_request(
             "action": [],
         }
 
-        # 5. 协议转换 (保持兼容性)
-        compact_response = CompactProtocol.compact(standard_response)
-        expanded_response = CompactProtocol.parse(compact_response)
-        logger.info("LLM 响应: %s", expanded_response)
+        logger.info("LLM 响应: %s", standard_response)
 
-        return expanded_response
+        return ORJSONResponse(standard_response)
     except Exception as exc:
         logger.exception("处理 LLM 请求失败: %s", exc)
         raise HTTPException(
@@ -160,7 +244,6 @@ async def save_llm_config(
 ) -> Dict[str, str]:
     """保存 LLM 配置并刷新后端依赖。"""
 
-    settings_path = Path("config/settings.json")
     try:
         logger.info(
             "收到 LLM 配置保存请求: provider=%s, model=%s, baseUrl=%s, apiKey=%s",
@@ -170,31 +253,31 @@ async def save_llm_config(
             _mask_api_key(payload.apiKey),
         )
 
-        config_data: Dict[str, Any] = {}
-        if settings_path.exists():
-            with open(settings_path, "r", encoding="utf-8") as file:
-                loaded = json.load(file)
-                if isinstance(loaded, dict):
-                    config_data = loaded
-        else:
-            settings_path.parent.mkdir(parents=True, exist_ok=True)
-
-        llm_section = config_data.get("llm", {})
-        if not isinstance(llm_section, dict):
-            llm_section = {}
-
-        llm_section.update(
-            {
-                "provider": payload.provider,
-                "model": payload.model,
-                "api_key": payload.apiKey,
-                "base_url": payload.baseUrl,
+        async with _settings_lock:
+            # 基于内存快照构建新配置并整体落盘，不再每次请求都读取并解析文件；
+            # 落盘成功后才替换快照，写入失败时内存中不会残留未保存的值
+            snapshot = await _get_settings_snapshot(request.app)
+            llm_section = snapshot.get("llm")
+            if not isinstance(llm_section, dict):
+                llm_section = {}
+
+            config_data = {
+                **snapshot,
+                "llm": {
+                    **llm_section,
+                    "provider": payload.provider,
+                    "model": payload.model,
+                    "api_key": payload.apiKey,
+                    "base_url": payload.baseUrl,
+                },
             }
-        )
-        config_data["llm"] = llm_section
-
-        with open(settings_path, "w", encoding="utf-8") as file:
-            json.dump(config_data, file, ensure_ascii=False, indent=2)
+            mtime_ns = await asyncio.to_thread(
+                _atomic_write,
+                SETTINGS_PATH,
+                orjson.dumps(config_data, option=orjson.OPT_INDENT_2),
+            )
+            request.app.state.settings = config_data
+            request.app.state.settings_mtime_ns = mtime_ns
 
         # 热重载 HTTP 路由使用的 LLM 实例
         if hasattr(llm, "_load_config"):
@@ -1,15 +1,16 @@
 """LLM 路由（Mock 版本）。
 
-该路由演示标准 JSON 请求与紧凑协议之间的转换流程，返回硬编码的对话响应。
+该路由演示标准 JSON 请求的处理流程，返回硬编码的对话响应。
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, ConfigDict, Field
 
-from api.protocol import CompactProtocol
+from api.responses import ORJSONResponse
 from core.dependencies import LLMDep
 
 logger = logging.getLogger("api.routes.llm")
@@ -17,6 +18,12 @@ logger = logging.getLogger("api.routes.llm")
 router = APIRouter(prefix="/api/llm", tags=["LLM"])
 
 
+@lru_cache(maxsize=64)
+def _system_prompt(companion_name: str) -> str:
+    """按伙伴名缓存系统提示词，避免每次请求重新拼接。"""
+    return f"你是一个 Minecraft 游戏中的 AI 伙伴。你的名字叫 {companion_name}。"
+
+
 class ActionCommand(BaseModel):
     """玩家指令动作。"""
 
@@ -47,23 +54,19 @@ class ConversationRequest(BaseModel):
 @router.post("/player")
 async def handle_player_request(
     payload: ConversationRequest, llm: LLMDep
-) -> Dict[str, Any]:
-    """接收玩家消息，压缩为紧凑协议并调用真实 LLM 服务。"""
+) -> ORJSONResponse:
+    """接收玩家消息并调用真实 LLM 服务。"""
 
     try:
-        standard_request: Dict[str, Any] = payload.model_dump(
-            by_alias=True, exclude_none=True
-        )
-
-        # 1. 构造 Prompt
-        player_name = standard_request.get("playerName", "Player")
-        message_content = standard_request.get("message", "")
+        # 1. 构造 Prompt（直接读取已校验的模型属性，无需 model_dump）
+        player_name = payload.playerName
+        message_content = payload.message or ""
 
         # 简单的 Prompt 构造 (后续可移至 core/personality)
         messages = [
             {
                 "role": "system",
-                "content": f"你是一个 Minecraft 游戏中的 AI 伙伴。你的名字叫 {standard_request.get('companionName', 'AI')}。",
+                "content": _system_prompt(payload.companionName or "AI"),
             },
             {"role": "user", "content": f"[{player_name}]: {message_content}"},
         ]
@@ -84,12 +87,9 @@ async def handle_player_request(
             "action": [],
         }
 
-        # 5. 协议转换 (保持兼容性)
-        compact_response = CompactProtocol.compact(standard_response)
-        expanded_response = CompactProtocol.parse(compact_response)
-        logger.info("LLM 响应: %s", expanded_response)
+        logger.info("LLM 响应: %s", standard_response)
 
-        return expanded_response
+        return ORJSONResponse(standard_response)
     except Exception as exc:
         logger.exception("处理 LLM 请求失败: %s", exc)
         raise HTTPException(
@@ -1,8 +1,12 @@
-"""WebSocket 消息验证模型"""
+"""WebSocket 消息验证模型
+
+类型与取值约束全部由 Literal / Dict 注解交给 pydantic-core 校验，
+不再额外挂 Python 层的 validator。
+"""
 
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 
 
 class ModMessageBase(BaseModel):
@@ -24,13 +28,6 @@ class GameStateUpdateMessage(ModMessageBase):
     type: Literal["game_state_update"]
     data: Dict[str, Any] = Field(..., description="游戏状态数据")
 
-    @validator("data")
-    def validate_game_state(cls, v):
-        """验证游戏状态数据"""
-        if not isinstance(v, dict):
-            raise ValueError("data 必须是字典类型")
-        return v
-
 
 class ConversationRequestMessage(ModMessageBase):
     """对话请求消息"""
@@ -61,24 +58,8 @@ class ModMessage(BaseModel):
     position: Optional[Dict[str, Any]] = None
     health: Optional[float] = None
 
-    @validator("type")
-    def validate_type(cls, v):
-        """验证消息类型"""
-        allowed = ["connection_init", "game_state_update", "conversation_request"]
-        if v not in allowed:
-            raise ValueError(f"消息类型必须是以下之一: {allowed}")
-        return v
-
 
 class MonitorCommand(BaseModel):
     """监控WebSocket命令"""
 
     type: Literal["clear_history", "reset_stats"]
-
-    @validator("type")
-    def validate_command_type(cls, v):
-        """验证命令类型"""
-        allowed = ["clear_history", "reset_stats"]
-        if v not in allowed:
-            raise ValueError(f"命令类型必须是以下之一: {allowed}")
-        return v
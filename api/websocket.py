@@ -1,9 +1,9 @@
-import json
 from datetime import datetime, timezone
-from uuid import uuid4
+from secrets import token_hex
 from typing import Any, Dict
 
 import logging
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 
 from core.monitor.event_types import MonitorEventType
@@ -20,7 +20,8 @@ from core.dependencies import (
     EngineManagerDep,
 )
 from config.settings import settings
-from api.handlers.registry import get_handler
+from api.handlers.base import send_payload
+from api.handlers.registry import MESSAGE_HANDLERS
 from api.handlers.context import HandlerContext
 
 router = APIRouter()
@@ -31,6 +32,17 @@ mod_rate_limiter = WebSocketRateLimiter(
     max_messages=settings.rate_limit_messages, window_seconds=settings.rate_limit_window
 )
 
+# 内容固定的错误帧在导入时编码一次，发送时直接复用字符串
+_ERR_RATE_LIMIT = orjson.dumps(
+    {"type": "error", "data": {"message": "消息发送过快，请稍后再试（限制：100条/分钟）"}}
+).decode("utf-8")
+_ERR_BAD_JSON = orjson.dumps(
+    {"type": "error", "data": {"message": "无法解析 JSON 数据"}}
+).decode("utf-8")
+_ERR_BAD_PROTOCOL = orjson.dumps(
+    {"type": "error", "data": {"message": "无法解析协议字段"}}
+).decode("utf-8")
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(
@@ -47,7 +59,7 @@ async def websocket_endpoint(
     当前实现：解析模组消息并触发监控事件
     TODO: 集成 LLM、记忆系统、决策引擎
     """
-    client_id = f"mod-{uuid4()}"
+    client_id = f"mod-{token_hex(8)}"
     await websocket.accept()
     conn_mgr.add(client_id, websocket)
     logger.info("[OK] Client connected: %s", client_id)
@@ -57,52 +69,75 @@ async def websocket_endpoint(
         {"client_id": client_id, "timestamp": connection_timestamp},
     )
     metrics.set_mod_connected(client_id)
+    # 上下文字段在连接期间不变，整个连接复用同一个实例
+    context = HandlerContext(
+        client_id=client_id,
+        event_bus=event_bus,
+        metrics=metrics,
+        llm_service=llm_service,
+        conversation_context=conversation_context,
+        engine_manager=engine_manager,
+    )
+    # 限流期间只回一次错误帧，洪水消息不再逐条触发发送
+    throttled = False
 
     try:
         while True:
-            # 接收消息
-            data = await websocket.receive_text()
-            
+            # 接收消息：文本帧与二进制帧均可，orjson 直接解析 str 或 bytes
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+            data = frame.get("text")
+            if data is None:
+                data = frame.get("bytes") or b""
+
             # 检查速率限制
             if not mod_rate_limiter.check_rate_limit(client_id):
-                error_response = {
-                    "type": "error",
-                    "data": {"message": "消息发送过快，请稍后再试（限制：100条/分钟）"},
-                }
-                await websocket.send_json(error_response)
+                if not throttled:
+                    throttled = True
+                    await websocket.send_text(_ERR_RATE_LIMIT)
                 continue  # 跳过此消息，但不断开连接
-
-            logger.debug("← Received from %s: %s...", client_id, data[:100])
+            throttled = False
+
+            # 预览会写入监控事件历史（/ws/monitor 的历史接口要返回它），
+            # 因此每条消息都要算一次；短于 100 字符的 str 切片不会复制
+            preview = (
+                data[:100]
+                if type(data) is str
+                else data[:100].decode("utf-8", "replace")
+            )
+            logger.debug("← Received from %s: %s...", client_id, preview)
+            # 本轮消息的所有监控事件共用同一时间戳
+            timestamp = datetime.now(timezone.utc).isoformat()
             try:
                 # 解析来自 Mod 的 JSON 消息
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                error_response = {
-                    "type": "error",
-                    "data": {"message": "无法解析 JSON 数据"},
-                }
-                await websocket.send_json(error_response)
-                logger.debug("→ Sent to %s: %s...", client_id, json.dumps(error_response)[:100])
-                error_timestamp = datetime.now(timezone.utc).isoformat()
-                event_bus.publish(
-                    MonitorEventType.MESSAGE_RECEIVED,
-                    {
-                        "client_id": client_id,
-                        "message_type": "invalid_json",
-                        "timestamp": error_timestamp,
-                        "preview": data[:100],
-                    },
-                )
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                await websocket.send_text(_ERR_BAD_JSON)
+                logger.debug("→ Sent to %s: %s", client_id, _ERR_BAD_JSON)
                 metrics.record_message_received("invalid_json")
                 metrics.update_mod_last_message()
                 metrics.record_message_sent("error")
-                event_bus.publish(
-                    MonitorEventType.MESSAGE_SENT,
-                    {
-                        "client_id": client_id,
-                        "message_type": "error",
-                        "timestamp": error_timestamp,
-                    },
+                event_bus.publish_batch(
+                    (
+                        (
+                            MonitorEventType.MESSAGE_RECEIVED,
+                            {
+                                "client_id": client_id,
+                                "message_type": "invalid_json",
+                                "timestamp": timestamp,
+                                "preview": preview,
+                            },
+                        ),
+                        (
+                            MonitorEventType.MESSAGE_SENT,
+                            {
+                                "client_id": client_id,
+                                "message_type": "error",
+                                "timestamp": timestamp,
+                            },
+                        ),
+                    )
                 )
                 continue
 
@@ -110,48 +145,33 @@ async def websocket_endpoint(
             try:
                 normalized_msg = CompactProtocol.parse(message)
             except Exception:
-                error_payload = {
-                    "type": "error",
-                    "data": {"message": "无法解析协议字段"},
-                }
-                await websocket.send_json(error_payload)
+                await websocket.send_text(_ERR_BAD_PROTOCOL)
                 metrics.record_message_sent("error")
                 event_bus.publish(
                     MonitorEventType.MESSAGE_SENT,
                     {
                         "client_id": client_id,
                         "message_type": "error",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                        "timestamp": timestamp,
                     },
                 )
                 continue
 
             msg_type = normalized_msg.get("type", "unknown")
-            timestamp = datetime.now(timezone.utc).isoformat()
-            preview = data[:100]
-            event_bus.publish(
-                MonitorEventType.MESSAGE_RECEIVED,
-                {
-                    "client_id": client_id,
-                    "message_type": msg_type,
-                    "timestamp": timestamp,
-                    "preview": preview,
-                },
-            )
+            received_event = {
+                "client_id": client_id,
+                "message_type": msg_type,
+                "timestamp": timestamp,
+                "preview": preview,
+            }
             metrics.record_message_received(msg_type)
             metrics.update_mod_last_message()
 
-            handler = get_handler(msg_type)
-            context = HandlerContext(
-                client_id=client_id,
-                event_bus=event_bus,
-                metrics=metrics,
-                llm_service=llm_service,
-                conversation_context=conversation_context,
-                engine_manager=engine_manager,
-            )
+            handler = MESSAGE_HANDLERS.get(msg_type)
             response_preview = None
             if handler:
+                # 处理器内部还会发布事件，接收事件须先于它们发出
+                event_bus.publish(MonitorEventType.MESSAGE_RECEIVED, received_event)
                 response_preview = await handler.handle(websocket, normalized_msg, context)
             else:
                 error_payload = {
@@ -161,19 +181,24 @@ async def websocket_endpoint(
                         "client_id": client_id,
                     },
                 }
-                await websocket.send_json(error_payload)
-                response_preview = json.dumps(error_payload)
+                response_preview = await send_payload(websocket, error_payload)
                 metrics.record_message_sent("error")
-                event_bus.publish(
-                    MonitorEventType.MESSAGE_SENT,
-                    {
-                        "client_id": client_id,
-                        "message_type": "error",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
+                event_bus.publish_batch(
+                    (
+                        (MonitorEventType.MESSAGE_RECEIVED, received_event),
+                        (
+                            MonitorEventType.MESSAGE_SENT,
+                            {
+                                "client_id": client_id,
+                                "message_type": "error",
+                                "timestamp": timestamp,
+                            },
+                        ),
+                    )
                 )
 
-            if response_preview:
+            # 响应预览只用于调试日志，未开启 DEBUG 时跳过切片
+            if response_preview and logger.isEnabledFor(logging.DEBUG):
                 logger.debug("→ Sent to %s: %s...", client_id, response_preview[:100])
 
     except WebSocketDisconnect:
@@ -203,27 +228,15 @@ async def send_json_to_mod(
     从 Web UI 转发原始 JSON 消息到当前已连接的模组。
     主要用于开发阶段临时调试通信链路。
     """
-    if conn_mgr.count() == 0:
+    # 优先使用 MetricsCollector 记录的模组连接 ID，失效时回退到任意活跃连接
+    target = conn_mgr.pick_target(metrics.get_connection_status().mod_client_id)
+    if target is None:
         raise HTTPException(status_code=503, detail="当前没有任何模组通过 WebSocket 连接")
+    target_id, websocket = target
 
-    # 优先使用 MetricsCollector 记录的模组连接 ID
-    connection_status = metrics.get_connection_status()
-    target_id = connection_status.mod_client_id
-
-    if not target_id or not conn_mgr.get(target_id):
-        # 回退：选择任意一个活跃连接
-        ids = conn_mgr.get_all_ids()
-        target_id = ids[0] if ids else None
-
-    if not target_id:
-        raise HTTPException(status_code=503, detail="找不到可用的模组连接")
-
-    websocket = conn_mgr.get(target_id)
-    if websocket is None:
-        raise HTTPException(status_code=503, detail="模组连接已失效，请重新连接后重试")
-
-    # 将前端提供的 JSON 原样下发给模组（已通过 Pydantic 验证）
-    await websocket.send_json(message.model_dump(exclude_none=True))
+    # 将前端提供的 JSON 原样下发给模组（已通过 Pydantic 验证）；
+    # model_dump_json 由 pydantic-core 直接序列化，不经过中间字典
+    await websocket.send_text(message.model_dump_json(exclude_none=True))
 
     msg_type = message.type
     metrics.record_message_sent(msg_type)
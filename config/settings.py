@@ -30,6 +30,9 @@ class Settings(BaseSettings):
     rate_limit_messages: int = 100
     rate_limit_window: int = 60
 
+    # 对话上下文配置：每个玩家会话保留的最近消息条数
+    conversation_history_size: int = 200
+
     # 日志配置（新增）
     log_level: str = "INFO"
 
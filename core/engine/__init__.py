@@ -1,7 +1,14 @@
 """WASM 引擎运行时模块导出。"""
 
 from .manager import EngineSessionManager
+from .persist import PersistWorker
 from .runtime import EngineHandle, WASMRuntime
 from .session import EngineSession
 
-__all__ = ["EngineHandle", "WASMRuntime", "EngineSession", "EngineSessionManager"]
+__all__ = [
+    "EngineHandle",
+    "WASMRuntime",
+    "EngineSession",
+    "EngineSessionManager",
+    "PersistWorker",
+]
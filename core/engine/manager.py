@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import heapq
+import time
+from datetime import timedelta
 from typing import Optional
 
+from core.engine.persist import PersistWorker
 from core.engine.runtime import WASMRuntime
 from core.engine.session import EngineSession
 from core.interfaces import EngineSessionManagerInterface
@@ -20,6 +23,15 @@ class EngineSessionManager(EngineSessionManagerInterface):
         self.vision_store = vision_store
         self.story_store = story_store
         self._sessions: dict[str, EngineSession] = {}
+        # 按 last_active_mono 排序的小顶堆；条目可能过期（会话已活跃），清理时惰性修正
+        self._expiry_heap: list[tuple[float, str]] = []
+        # world_diff 的持久化写入由后台任务完成；未调用 start 时会话当场写入
+        self.persister = PersistWorker(vision_store, story_store)
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台持久化任务。"""
+
+        self.persister.start()
 
     async def get_or_create(
         self,
@@ -34,9 +46,12 @@ class EngineSessionManager(EngineSessionManagerInterface):
         if session is not None and session.initialized:
             return session
 
-        session = EngineSession(session_id=session_id, character_id=character_id)
+        session = EngineSession(
+            session_id=session_id, character_id=character_id, persister=self.persister
+        )
         await session.initialize(self.runtime, self.vision_store, self.story_store, character_card, config)
         self._sessions[session_id] = session
+        heapq.heappush(self._expiry_heap, (session.last_active_mono, session_id))
 
         return session
 
@@ -48,22 +63,32 @@ class EngineSessionManager(EngineSessionManagerInterface):
     async def cleanup_idle(self, timeout: timedelta = timedelta(minutes=30)) -> None:
         """关闭超时未活跃的会话并释放资源。"""
 
-        now = datetime.now(timezone.utc)
-        stale_ids = [
-            session_id
-            for session_id, session in self._sessions.items()
-            if now - session.last_active > timeout
-        ]
-
-        for session_id in stale_ids:
-            session = self._sessions.pop(session_id, None)
-            if session is not None:
+        now = time.monotonic()
+        limit = timeout.total_seconds()
+        heap = self._expiry_heap
+
+        # 只弹出堆顶已超时的条目，未超时的会话无需逐个比较
+        while heap and now - heap[0][0] > limit:
+            stamp, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            if session is None:
+                continue
+            last_active = session.last_active_mono
+            if now - last_active > limit:
+                del self._sessions[session_id]
                 session.close()
+            elif last_active != stamp:
+                # 会话期间有活动：按最新时间重新入堆
+                heapq.heappush(heap, (last_active, session_id))
 
     async def close_all(self) -> None:
         """关闭所有会话，供服务停止时调用。"""
 
+        # 先写完已排队的持久化数据
+        await self.persister.stop()
+
         for session in list(self._sessions.values()):
             session.close()
 
         self._sessions.clear()
+        self._expiry_heap.clear()
@@ -0,0 +1,92 @@
+"""引擎会话的后台持久化：把快照与剧情节点写入移出 world_diff 的响应路径。"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from core.storage.story import StoryStore
+from core.storage.vision import VisionStore
+
+logger = logging.getLogger("core.engine.persist")
+
+PERSIST_QUEUE_SIZE = 1000
+
+
+async def write_session_state(
+    vision_store: VisionStore,
+    story_store: StoryStore,
+    session_id: str,
+    vision_snapshot: Optional[dict],
+    tick: int,
+    story_events: list[dict],
+) -> None:
+    """写入一轮 world_diff 的结果：快照与批量剧情节点并发落盘。"""
+    writes = []
+    if vision_snapshot is not None:
+        writes.append(vision_store.save(session_id, vision_snapshot, tick))
+    if story_events:
+        writes.append(story_store.append_many(session_id, story_events))
+    if writes:
+        await asyncio.gather(*writes)
+
+
+class PersistWorker:
+    """有界队列 + 单个常驻写入任务。
+
+    队列满时 submit 等待空位（背压），保证同一会话的写入顺序不被打乱；
+    任务未启动时 submit 返回 False，由调用方直接写入。
+    """
+
+    def __init__(
+        self,
+        vision_store: VisionStore,
+        story_store: StoryStore,
+        maxsize: int = PERSIST_QUEUE_SIZE,
+    ) -> None:
+        self.vision_store = vision_store
+        self.story_store = story_store
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """在当前事件循环中启动写入任务。"""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """写完已排队的数据后停止写入任务。"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        await self._queue.join()
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def submit(
+        self,
+        session_id: str,
+        vision_snapshot: Optional[dict],
+        tick: int,
+        story_events: list[dict],
+    ) -> bool:
+        """排队一次写入；返回 False 表示未排队，需要调用方自行写入。"""
+        if self._task is None:
+            return False
+        # 队列未满时 put 不会挂起
+        await self._queue.put((session_id, vision_snapshot, tick, story_events))
+        return True
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            item = await queue.get()
+            try:
+                await write_session_state(self.vision_store, self.story_store, *item)
+            except Exception:  # noqa: BLE001
+                # 单次写入失败不应终止常驻任务
+                logger.exception("会话持久化失败: session=%s", item[0])
+            finally:
+                queue.task_done()
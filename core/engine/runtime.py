@@ -16,9 +16,9 @@ from core.interfaces import EngineHandleInterface, WASMRuntimeInterface
 WASM_FILE_NAME = "llmnemeust_bg.wasm"
 
 
-@dataclass
+@dataclass(slots=True)
 class EngineHandle(EngineHandleInterface):
-    """封装单个 WASM Engine 实例的上下文。"""
+    """封装单个 WASM Engine 实例的上下文（slots 加速热路径上的字段访问）。"""
 
     store: wasmtime.Store
     instance: wasmtime.Instance
@@ -29,6 +29,9 @@ class EngineHandle(EngineHandleInterface):
     malloc: wasmtime.Func
     free: wasmtime.Func
     drop: wasmtime.Func
+    # 线性内存基址与长度缓存：只有 memory.grow 会让它们变化，见 WASMRuntime._sync_memory
+    mem_base: int = 0
+    mem_len: int = 0
 
     def close(self) -> None:
         """显式释放引擎实例。"""
@@ -46,18 +49,20 @@ class WASMRuntime(WASMRuntimeInterface):
         self._engine = wasmtime.Engine()
         self._module = wasmtime.Module.from_file(self._engine, str(self._wasm_path))
 
-    def create_engine(self, config_json: str) -> EngineHandle:
-        """加载 WASM 模块并创建 Engine 实例。"""
+    def create_engine(self, config_json: str | bytes) -> EngineHandle:
+        """加载 WASM 模块并创建 Engine 实例（配置可直接传 UTF-8 bytes）。"""
         store = wasmtime.Store(self._engine)
-        memory_ref: list[Optional[wasmtime.Memory]] = [None]
+        handle_ref: list[Optional[EngineHandle]] = [None]
 
         def _host_throw(ptr: int, length: int) -> None:
             """处理 WASM 侧抛出的异常。"""
             message = "WASM 执行异常"
-            memory = memory_ref[0]
-            if memory is not None:
+            handle = handle_ref[0]
+            if handle is not None:
                 try:
-                    message = self._read_utf8(memory, store, ptr, length)
+                    # 抛出前 guest 可能已扩容内存，先校正缓存
+                    self._sync_memory(handle)
+                    message = self._read_utf8(handle, ptr, length)
                 except Exception:
                     message = f"{message}（无法读取异常信息）"
             raise RuntimeError(message)
@@ -82,37 +87,32 @@ class WASMRuntime(WASMRuntimeInterface):
         instance = wasmtime.Instance(store, self._module, imports)
         exports = instance.exports(store)
 
-        memory = exports["memory"]
-        memory_ref[0] = memory
-
         engine_new = exports["engine_new"]
-        engine_process = exports["engine_process"]
-        engine_tick = exports["engine_tick"]
-        malloc = exports["__wbindgen_malloc"]
-        free = exports["__wbindgen_free"]
-        drop = exports["__wbg_engine_free"]
-
-        config_ptr, config_len = self._write_utf8(memory, store, malloc, config_json)
-        engine_ptr = engine_new(store, config_ptr, config_len)
-
-        return EngineHandle(
+        handle = EngineHandle(
             store=store,
             instance=instance,
-            memory=memory,
-            engine_ptr=engine_ptr,
-            engine_process=engine_process,
-            engine_tick=engine_tick,
-            malloc=malloc,
-            free=free,
-            drop=drop,
+            memory=exports["memory"],
+            engine_ptr=0,
+            engine_process=exports["engine_process"],
+            engine_tick=exports["engine_tick"],
+            malloc=exports["__wbindgen_malloc"],
+            free=exports["__wbindgen_free"],
+            drop=exports["__wbg_engine_free"],
         )
+        handle_ref[0] = handle
+        self._sync_memory(handle)
+
+        config_ptr, config_len = self._write_utf8(handle, config_json)
+        handle.engine_ptr = engine_new(store, config_ptr, config_len)
 
-    def process(self, handle: EngineHandleInterface, input_json: str) -> List[str]:
-        """调用引擎的 process 方法并返回 JSON Lines 列表。"""
+        return handle
+
+    def process(
+        self, handle: EngineHandleInterface, input_json: str | bytes
+    ) -> List[str]:
+        """调用引擎的 process 方法并返回 JSON Lines 列表（输入可直接传 UTF-8 bytes）。"""
         engine_handle = self._ensure_handle(handle)
-        input_ptr, input_len = self._write_utf8(
-            engine_handle.memory, engine_handle.store, engine_handle.malloc, input_json
-        )
+        input_ptr, input_len = self._write_utf8(engine_handle, input_json)
 
         result_ptr, result_len = self._unwrap_pair(
             engine_handle.engine_process(
@@ -138,51 +138,57 @@ class WASMRuntime(WASMRuntimeInterface):
         self, handle: EngineHandle, result_ptr: int, result_len: int
     ) -> List[str]:
         """读取 WASM 返回的字符串并拆分为行。"""
-        memory = handle.memory
-        store = handle.store
+        # process / tick 期间 guest 可能扩容内存，读取前校正缓存
+        self._sync_memory(handle)
         try:
-            output = self._read_utf8(memory, store, result_ptr, result_len)
+            output = self._read_utf8(handle, result_ptr, result_len)
         finally:
             # wasm-bindgen 返回的字符串由宿主负责释放，按惯例对齐参数传 1
-            handle.free(store, result_ptr, result_len, 1)
+            handle.free(handle.store, result_ptr, result_len, 1)
+
+        return [line for line in output.splitlines() if line.strip()]
 
-        return [line for line in output.splitlines() if line]
+    def _sync_memory(self, handle: EngineHandle) -> None:
+        """在 guest 调用之后校正缓存的内存基址。
 
-    def _read_utf8(
-        self, memory: wasmtime.Memory, store: wasmtime.Store, ptr: int, length: int
-    ) -> str:
-        """从 WASM 线性内存中读取 UTF-8 字符串。"""
+        线性内存只会因 memory.grow 变长，基址也只可能在此时移动；
+        因此每次 guest 调用后只查一次长度，长度变化时才重新取指针。
+        """
+        store = handle.store
+        length = handle.memory.data_len(store)
+        if length != handle.mem_len:
+            raw_ptr = handle.memory.data_ptr(store)
+            handle.mem_base = ctypes.addressof(raw_ptr.contents)
+            handle.mem_len = length
+
+    def _read_utf8(self, handle: EngineHandle, ptr: int, length: int) -> str:
+        """从 WASM 线性内存中读取 UTF-8 字符串（调用方需先 _sync_memory）。"""
         if length == 0:
             return ""
 
-        total_len = memory.data_len(store)
-        if ptr < 0 or ptr + length > total_len:
+        if ptr < 0 or ptr + length > handle.mem_len:
             raise MemoryError("WASM 内存读取越界")
 
-        raw_ptr = memory.data_ptr(store)
-        addr = ctypes.addressof(raw_ptr.contents) + ptr
-        data = ctypes.string_at(addr, length)
-        return data.decode("utf-8")
-
-    def _write_utf8(
-        self,
-        memory: wasmtime.Memory,
-        store: wasmtime.Store,
-        malloc_fn: wasmtime.Func,
-        text: str,
-    ) -> tuple[int, int]:
-        """编码字符串并写入 WASM 内存，返回指针与长度。"""
-        encoded = text.encode("utf-8")
+        addr = handle.mem_base + ptr
+        # 直接在 WASM 内存视图上解码，省去 string_at 的中间 bytes 拷贝
+        view = memoryview((ctypes.c_ubyte * length).from_address(addr))
+        return str(view, "utf-8")
+
+    def _write_utf8(self, handle: EngineHandle, text: str | bytes) -> tuple[int, int]:
+        """编码字符串并写入 WASM 内存，返回指针与长度。
+
+        传入 bytes 时视为已编码的 UTF-8，直接写入，避免 str 往返。
+        """
+        encoded = text if isinstance(text, bytes) else text.encode("utf-8")
         length = len(encoded)
-        ptr = malloc_fn(store, length, 1)
+        ptr = handle.malloc(handle.store, length, 1)
 
         if length:
-            total_len = memory.data_len(store)
-            if ptr < 0 or ptr + length > total_len:
+            # malloc 可能触发 memory.grow
+            self._sync_memory(handle)
+            if ptr < 0 or ptr + length > handle.mem_len:
                 raise MemoryError("WASM 内存写入越界")
-            raw_ptr = memory.data_ptr(store)
-            dest = ctypes.addressof(raw_ptr.contents) + ptr
-            ctypes.memmove(dest, encoded, length)
+            ctypes.memmove(handle.mem_base + ptr, encoded, length)
 
         return ptr, length
 
@@ -4,17 +4,40 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 import orjson
 
+from core.engine.persist import PersistWorker, write_session_state
 from core.engine.runtime import EngineHandle, WASMRuntime
 from core.interfaces import EngineSessionInterface
 from core.storage.story import StoryStore
 from core.storage.vision import VisionStore
 
 
+# world_change 事件信封的固定前缀：只序列化可变的 data 部分再拼接
+_WORLD_CHANGE_PREFIX = b'{"type":"event","kind":"world_change","data":'
+_WORLD_CHANGE_SUFFIX = b"}"
+
+
+# 规范化时使用的默认值：结果只会被序列化（发给引擎或落盘），可以安全共享
+_DEFAULT_PARAMS = {"temperature": 0.7, "top_p": 0.9, "max_tokens": 256}
+_DEFAULT_ENVIRONMENT = {
+    "time_of_day": 6000,
+    "weather": "clear",
+    "biome": "minecraft:plains",
+}
+_VISION_KEYS = frozenset(("entities", "blocks", "environment", "tick"))
+
+
+def _parse_outputs(outputs: list[str]) -> list[dict]:
+    """将引擎输出的 JSON Lines 拼成数组，一次 orjson.loads 解析完毕。"""
+    if not outputs:
+        return []
+    return orjson.loads("[" + ",".join(outputs) + "]")
+
+
 def _normalize_character_card(card: dict) -> dict:
     """规范化 CharacterCard 格式以匹配 Engine 协议。"""
     if "meta" in card and "content" in card:
@@ -36,7 +59,7 @@ def _normalize_config(config: dict) -> dict:
     return {
         "llm_model": config.get("llm_model", "gpt-4o-mini"),
         "enable_kv_cache": config.get("enable_kv_cache", True),
-        "params": config.get("params", {"temperature": 0.7, "top_p": 0.9, "max_tokens": 256}),
+        "params": config.get("params", _DEFAULT_PARAMS),
         "emit_vision_snapshot": config.get("emit_vision_snapshot", True),
     }
 
@@ -45,10 +68,13 @@ def _normalize_vision(vision: Optional[dict]) -> dict:
     """规范化 VisionSnapshot 格式以匹配 Engine 协议。"""
     if not vision:
         vision = {}
+    elif vision.keys() == _VISION_KEYS:
+        # 字段恰好齐全时已符合协议，直接复用，省去重建
+        return vision
     return {
         "entities": vision.get("entities", []),
         "blocks": vision.get("blocks", []),
-        "environment": vision.get("environment", {"time_of_day": 6000, "weather": "clear", "biome": "minecraft:plains"}),
+        "environment": vision.get("environment", _DEFAULT_ENVIRONMENT),
         "tick": vision.get("tick", 0),
     }
 
@@ -57,7 +83,10 @@ def _normalize_world_diff(diff: dict) -> dict:
     """规范化 WorldDiff 格式以匹配 Engine 协议。"""
     return {
         "tick": diff.get("tick", 0),
-        "timestamp_ms": diff.get("timestamp_ms", int(time.time() * 1000)),
+        # 默认时间戳只在缺字段时才取，避免每次都读时钟
+        "timestamp_ms": (
+            diff["timestamp_ms"] if "timestamp_ms" in diff else int(time.time() * 1000)
+        ),
         "blocks": diff.get("blocks", []),
         "entities": diff.get("entities", []),
         "player_actions": diff.get("player_actions", []),
@@ -87,7 +116,16 @@ class EngineSession(EngineSessionInterface):
     character_id: str
     handle: Optional[EngineHandle] = None
     initialized: bool = False
-    last_active: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # 单调时钟秒数：只用于空闲判定，热路径上不构造带时区的 datetime
+    last_active_mono: float = field(default_factory=time.monotonic)
+    # 由 EngineSessionManager 注入的后台持久化任务
+    persister: Optional[PersistWorker] = None
+
+    @property
+    def last_active(self) -> datetime:
+        """最近活跃的 UTC 时间，由单调时钟换算，仅供展示。"""
+        idle = time.monotonic() - self.last_active_mono
+        return datetime.now(timezone.utc) - timedelta(seconds=idle)
 
     async def initialize(
         self,
@@ -102,7 +140,8 @@ class EngineSession(EngineSessionInterface):
         vision_snapshot = await vision_store.load(self.session_id) or {}
         story_history = await story_store.load_history(self.session_id)
 
-        self.handle = runtime.create_engine(orjson.dumps(config).decode("utf-8"))
+        # orjson 输出即 UTF-8 bytes，直接交给运行时写入 WASM 内存
+        self.handle = runtime.create_engine(orjson.dumps(config))
 
         init_payload = {
             "type": "init",
@@ -113,11 +152,11 @@ class EngineSession(EngineSessionInterface):
             "story_history": story_history,
         }
 
-        outputs = runtime.process(self.handle, orjson.dumps(init_payload).decode("utf-8"))
+        outputs = runtime.process(self.handle, orjson.dumps(init_payload))
         self.initialized = True
-        self.last_active = datetime.now(timezone.utc)
+        self.last_active_mono = time.monotonic()
 
-        return [orjson.loads(line) for line in outputs if line.strip()]
+        return _parse_outputs(outputs)
 
     async def on_world_diff(
         self,
@@ -137,35 +176,47 @@ class EngineSession(EngineSessionInterface):
                 }
             ]
 
-        self.last_active = datetime.now(timezone.utc)
+        self.last_active_mono = time.monotonic()
 
         normalized_diff = _normalize_world_diff(diff)
 
-        event_payload = {
-            "type": "event",
-            "kind": "world_change",
-            "data": normalized_diff,
-        }
-
-        outputs = runtime.process(self.handle, orjson.dumps(event_payload).decode("utf-8"))
-        parsed = [orjson.loads(line) for line in outputs if line.strip()]
-
-        vision_snapshot = normalized_diff.get("vision") if isinstance(normalized_diff, dict) else None
-        tick_value = normalized_diff.get("tick") if isinstance(normalized_diff, dict) else None
-        if vision_snapshot is not None:
-            tick = tick_value
-            if tick is None and isinstance(vision_snapshot, dict):
-                tick = vision_snapshot.get("tick", 0)
-            await vision_store.save(self.session_id, vision_snapshot, int(tick or 0))
+        # 等价于序列化 {"type": "event", "kind": "world_change", "data": ...}
+        event_json = b"".join(
+            (_WORLD_CHANGE_PREFIX, orjson.dumps(normalized_diff), _WORLD_CHANGE_SUFFIX)
+        )
+        outputs = runtime.process(self.handle, event_json)
+        parsed = _parse_outputs(outputs)
 
         results: list[dict] = []
+        story_events: list[dict] = []
         for output in parsed:
             output_type = output.get("type")
             if output_type == "story_event":
-                await story_store.append(self.session_id, _normalize_story_event(output))
+                story_events.append(_normalize_story_event(output))
             if output_type in ("mod_action", "utterance"):
                 results.append(output)
 
+        vision_snapshot = normalized_diff.get("vision") if isinstance(normalized_diff, dict) else None
+        tick_value = normalized_diff.get("tick") if isinstance(normalized_diff, dict) else None
+        tick = tick_value
+        if tick is None and isinstance(vision_snapshot, dict):
+            tick = vision_snapshot.get("tick", 0)
+        tick = int(tick or 0)
+
+        # 返回值只取决于引擎输出：持久化交给后台写入任务，未启用时当场写入
+        persister = self.persister
+        if persister is None or not await persister.submit(
+            self.session_id, vision_snapshot, tick, story_events
+        ):
+            await write_session_state(
+                vision_store,
+                story_store,
+                self.session_id,
+                vision_snapshot,
+                tick,
+                story_events,
+            )
+
         return results
 
     async def on_player_message(
@@ -185,7 +236,7 @@ class EngineSession(EngineSessionInterface):
                 }
             ]
 
-        self.last_active = datetime.now(timezone.utc)
+        self.last_active_mono = time.monotonic()
 
         payload = {
             "type": "player_message",
@@ -193,8 +244,8 @@ class EngineSession(EngineSessionInterface):
             "text": text,
         }
 
-        outputs = runtime.process(self.handle, orjson.dumps(payload).decode("utf-8"))
-        return [orjson.loads(line) for line in outputs if line.strip()]
+        outputs = runtime.process(self.handle, orjson.dumps(payload))
+        return _parse_outputs(outputs)
 
     def close(self) -> None:
         """释放底层 WASM 资源。"""
@@ -6,13 +6,26 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Protocol
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
 
 from core.monitor.event_types import MonitorEventType
 from models.monitor import ConnectionStatus, MessageStats, TokenTrendStats
 
 if TYPE_CHECKING:
-    from core.memory.conversation_context import ConversationSession
+    from core.memory.conversation_context import (
+        ConversationMessage,
+        ConversationSession,
+    )
 
 
 class EventBusInterface(Protocol):
@@ -25,6 +38,12 @@ class EventBusInterface(Protocol):
         severity: str = "info",
     ) -> None: ...
 
+    def publish_batch(
+        self,
+        events: Iterable[Tuple[MonitorEventType, Dict[str, Any]]],
+        severity: str = "info",
+    ) -> None: ...
+
     def subscribe(
         self, event_type: MonitorEventType, callback: Callable[[Dict[str, Any]], None]
     ) -> None: ...
@@ -87,6 +106,10 @@ class ConnectionManagerInterface(Protocol):
 
     def count(self) -> int: ...
 
+    def pick_target(
+        self, preferred_id: Optional[str] = None
+    ) -> tuple[str, Any] | None: ...
+
 
 class ConversationContextInterface(Protocol):
     """会话上下文接口，管理游戏玩家的历史消息。"""
@@ -99,7 +122,9 @@ class ConversationContextInterface(Protocol):
         self, client_id: str, role: str, content: str, player_name: Optional[str] = None
     ) -> None: ...
 
-    def get_history(self, client_id: str) -> List[Dict[str, Any]]: ...
+    def get_history(self, client_id: str) -> List["ConversationMessage"]: ...
+
+    def get_llm_history(self, client_id: str) -> List[Dict[str, str]]: ...
 
     def clear_session(self, client_id: str) -> None: ...
 
@@ -113,9 +138,11 @@ class EngineHandleInterface(Protocol):
 class WASMRuntimeInterface(Protocol):
     """WASM 运行时接口，负责创建与驱动引擎实例。"""
 
-    def create_engine(self, config_json: str) -> EngineHandleInterface: ...
+    def create_engine(self, config_json: str | bytes) -> EngineHandleInterface: ...
 
-    def process(self, handle: EngineHandleInterface, input_json: str) -> List[str]: ...
+    def process(
+        self, handle: EngineHandleInterface, input_json: str | bytes
+    ) -> List[str]: ...
 
     def tick(self, handle: EngineHandleInterface, elapsed_ms: int) -> List[str]: ...
 
@@ -126,7 +153,10 @@ class EngineSessionInterface(Protocol):
     session_id: str
     character_id: str
     initialized: bool
-    last_active: datetime
+    last_active_mono: float
+
+    @property
+    def last_active(self) -> datetime: ...
 
     async def on_world_diff(
         self,
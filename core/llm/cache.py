@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from typing import List, Dict, Any
 
+import orjson
+
 
 def generate_cache_key(messages: List[Dict[str, Any]], model: str, temperature: float) -> str:
     """为 LLM 请求生成稳定的缓存键。"""
@@ -14,5 +15,8 @@ def generate_cache_key(messages: List[Dict[str, Any]], model: str, temperature:
         "model": model,
         "temperature": temperature,
     }
-    content = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-    return f"llm:cache:{hashlib.sha256(content.encode()).hexdigest()}"
+    # orjson 递归排序键并直接输出 UTF-8 bytes，可原样交给哈希函数
+    content = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    # 缓存键只需区分请求，不需要密码学强度；blake2b 128 位摘要比 sha256 更快也更短
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return f"llm:cache:{digest}"
@@ -7,17 +7,25 @@ import os
 import json
 import logging
 from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
 import litellm
+import orjson
 
 try:
     from litellm.exceptions import LiteLLMException
 except Exception:  # noqa: BLE001
     LiteLLMException = Exception
 
+try:
+    from litellm import ModelResponse
+except Exception:  # noqa: BLE001
+    ModelResponse = None
+
 from core.llm.cache import generate_cache_key
 from core.storage.interfaces import CacheStorage
 from config.settings import settings
@@ -27,6 +35,131 @@ load_dotenv()
 
 logger = logging.getLogger("core.llm.service")
 
+# 浏览器请求头模板，用于绕过中转站的反爬虫拦截；只读，每次请求复制后再补充
+_DEFAULT_EXTRA_HEADERS: Mapping[str, str] = MappingProxyType(
+    {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+        "Accept": "application/json",
+        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    }
+)
+
+_DEFAULT_API_BASES = {
+    "openai": "https://api.openai.com/v1",
+    "anthropic": "https://api.anthropic.com/v1",
+    "gemini": "https://generativelanguage.googleapis.com/v1beta",
+}
+
+
+def _guess_endpoint(provider_lower: str, model: Optional[str]) -> str:
+    if "anthropic" in provider_lower:
+        return "messages"
+    if provider_lower.startswith("azure"):
+        return "chat/completions"
+    if "gemini" in provider_lower or provider_lower == "google":
+        if model:
+            return f"models/{model}:generateContent"
+        return "models:generateContent"
+    if "ollama" in provider_lower:
+        return "api/chat"
+    return "chat/completions"
+
+
+@lru_cache(maxsize=64)
+def _build_request_url(
+    provider: str,
+    model: Optional[str],
+    api_base: Optional[str],
+    api_version: Optional[str],
+) -> Optional[str]:
+    """按 (provider, model, api_base, api_version) 推断请求 URL。
+
+    这些输入基本随配置固定，结果用 lru_cache 缓存，避免每次请求重复拼接字符串。
+    """
+    provider_lower = provider.lower()
+    base_url = api_base or _DEFAULT_API_BASES.get(provider_lower)
+    if not base_url:
+        return None
+
+    endpoint = _guess_endpoint(provider_lower, model)
+    normalized = base_url.rstrip("/")
+    query = ""
+    if provider_lower.startswith("azure") and "?" not in normalized and api_version:
+        query = f"?api-version={api_version}"
+    return f"{normalized}/{endpoint}{query}"
+
+
+def _json_text_to_dict(text: str) -> Dict[str, Any]:
+    try:
+        parsed = orjson.loads(text)
+    except orjson.JSONDecodeError as exc:
+        raise ValueError("响应字符串不是合法 JSON 数据") from exc
+    if isinstance(parsed, dict):
+        return parsed
+    return {"data": parsed}
+
+
+# 常见响应类型按精确类型直接分派，跳过 isinstance/hasattr 链；子类仍走通用分支
+_RESPONSE_CONVERTERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    dict: lambda response: response,
+    str: _json_text_to_dict,
+}
+if ModelResponse is not None:
+    _RESPONSE_CONVERTERS[ModelResponse] = lambda response: response.model_dump()
+
+
+class _ModelTarget(NamedTuple):
+    """由配置推导出的请求目标：provider、完整模型名、api_base 与请求头模板。"""
+
+    provider: str
+    model: str
+    api_base: Optional[str]
+    headers: Mapping[str, str]
+
+
+@lru_cache(maxsize=64)
+def _resolve_model_target(provider: str, model: str, base_url: str) -> _ModelTarget:
+    """按 (provider, model, base_url) 推导请求目标。
+
+    这些值只随配置变化，结果用 lru_cache 缓存；配置被原地修改时键随之改变，
+    不会用到旧结果。
+    """
+    # 对于 custom provider（OpenAI 兼容的第三方 API），转换为 openai
+    # 这样 LiteLLM 会使用 OpenAI 的协议格式 + 自定义 api_base
+    if provider == "custom":
+        provider = "openai"
+
+    # 构建完整的模型名称
+    # 如果是 openai 兼容的第三方服务，通常不需要加 provider 前缀，或者直接用 model 名
+    # LiteLLM 约定：对于 openai 兼容接口，如果 provider 是 openai，可以直接用 model 名
+    # 如果是 anthropic/gemini 等，litellm 通常需要前缀，如 "anthropic/claude-3"
+    # 这里我们做一个简单的处理：如果 provider 不是 openai，且 model 不包含 /，则加上前缀
+    full_model_name = model
+    if provider == "openai":
+        normalized_model = model.split("/", 1)[-1]
+        full_model_name = f"openai/{normalized_model}"
+    elif "/" not in model:
+        full_model_name = f"{provider}/{model}"
+
+    # 如果有 base_url (用于 DeepSeek, Moonshot, Local 等)
+    api_base: Optional[str] = None
+    headers: Mapping[str, str] = _DEFAULT_EXTRA_HEADERS
+    if base_url:
+        base_domain = base_url.rstrip("/")
+        api_base = base_domain
+        if provider == "openai" and not api_base.endswith("/v1"):
+            api_base = f"{api_base}/v1"
+        # 如果有 base_url，添加 Referer 和 Origin
+        headers = MappingProxyType(
+            {
+                **_DEFAULT_EXTRA_HEADERS,
+                "Referer": f"{base_domain}/",
+                "Origin": base_domain,
+            }
+        )
+
+    return _ModelTarget(provider, full_model_name, api_base, headers)
+
 
 class LLMService:
     """LLM 服务类，封装 LiteLLM 调用。"""
@@ -47,16 +180,13 @@ class LLMService:
     @staticmethod
     def _response_to_dict(response: Any) -> Dict[str, Any]:
         """统一转成原生字典，便于后续缓存与序列化。"""
+        converter = _RESPONSE_CONVERTERS.get(type(response))
+        if converter is not None:
+            return converter(response)
         if isinstance(response, dict):
             return response
         if isinstance(response, str):
-            try:
-                parsed = json.loads(response)
-            except json.JSONDecodeError as exc:
-                raise ValueError("响应字符串不是合法 JSON 数据") from exc
-            if isinstance(parsed, dict):
-                return parsed
-            return {"data": parsed}
+            return _json_text_to_dict(response)
         if hasattr(response, "model_dump"):
             return response.model_dump()
         if hasattr(response, "dict"):
@@ -64,11 +194,15 @@ class LLMService:
         if hasattr(response, "json"):
             try:
                 raw_json = response.json()
-                parsed = json.loads(raw_json) if isinstance(raw_json, str) else raw_json
+                parsed = (
+                    orjson.loads(raw_json)
+                    if isinstance(raw_json, (str, bytes))
+                    else raw_json
+                )
                 if isinstance(parsed, dict):
                     return parsed
                 return {"data": parsed}
-            except (TypeError, json.JSONDecodeError) as exc:
+            except (TypeError, orjson.JSONDecodeError) as exc:
                 raise ValueError("响应 json() 结果不是合法 JSON 数据") from exc
             except Exception as exc:  # noqa: BLE001
                 raise ValueError("响应对象的 json() 方法执行失败") from exc
@@ -81,8 +215,11 @@ class LLMService:
             raise TypeError(f"对象 {type(obj).__name__} 无法被序列化")
 
         try:
-            serialized = json.dumps(response, default=_default_serializer)
-            parsed = json.loads(serialized)
+            # orjson 输出 bytes，直接交回 orjson.loads；非字符串键按 json 模块的行为转成字符串
+            serialized = orjson.dumps(
+                response, default=_default_serializer, option=orjson.OPT_NON_STR_KEYS
+            )
+            parsed = orjson.loads(serialized)
         except (TypeError, ValueError) as exc:
             raise ValueError("无法将响应序列化为 JSON") from exc
         if isinstance(parsed, dict):
@@ -130,53 +267,12 @@ class LLMService:
 
     def _resolve_request_url(self, provider: str, params: Dict[str, Any]) -> Optional[str]:
         """尝试推断真实的 HTTP 请求 URL。"""
-        endpoint = self._guess_endpoint(provider, params)
-        provider_lower = provider.lower()
-
-        api_base = params.get("api_base") or self.config.get("base_url")
-        if api_base:
-            return self._compose_url(api_base, endpoint, provider_lower, params)
-
-        default_bases = {
-            "openai": "https://api.openai.com/v1",
-            "anthropic": "https://api.anthropic.com/v1",
-            "gemini": "https://generativelanguage.googleapis.com/v1beta",
-        }
-        base_candidate = default_bases.get(provider_lower)
-        if base_candidate:
-            return self._compose_url(base_candidate, endpoint, provider_lower, params)
-        return None
-
-    @staticmethod
-    def _compose_url(
-        base_url: str,
-        endpoint: str,
-        provider_lower: str,
-        params: Dict[str, Any],
-    ) -> str:
-        normalized = base_url.rstrip("/")
-        query = ""
-        if provider_lower.startswith("azure") and "?" not in normalized:
-            api_version = params.get("api_version")
-            if api_version:
-                query = f"?api-version={api_version}"
-        return f"{normalized}/{endpoint}{query}"
-
-    @staticmethod
-    def _guess_endpoint(provider: str, params: Dict[str, Any]) -> str:
-        provider_lower = provider.lower()
-        if "anthropic" in provider_lower:
-            return "messages"
-        if provider_lower.startswith("azure"):
-            return "chat/completions"
-        if "gemini" in provider_lower or provider_lower == "google":
-            model_name = params.get("model")
-            if model_name:
-                return f"models/{model_name}:generateContent"
-            return "models:generateContent"
-        if "ollama" in provider_lower:
-            return "api/chat"
-        return "chat/completions"
+        return _build_request_url(
+            provider,
+            params.get("model"),
+            params.get("api_base") or self.config.get("base_url"),
+            params.get("api_version"),
+        )
 
     def _log_http_debug_response(self, resp: Any, request_url: Optional[str]) -> None:
         """记录 HTTP 响应的调试信息，帮助定位解析失败问题。"""
@@ -236,25 +332,22 @@ class LLMService:
         params: Dict[str, Any] | None = None
 
         try:
-            # 对于 custom provider（OpenAI 兼容的第三方 API），转换为 openai
-            # 这样 LiteLLM 会使用 OpenAI 的协议格式 + 自定义 api_base
+            # 缓存键只依赖消息、模型与温度，先查缓存：命中时跳过参数/请求头组装与日志
+            cache_key = None
+            if use_cache and settings.llm_cache_enabled and self.cache:
+                cache_key = generate_cache_key(messages, self.config["model"], temperature)
+                cached = await self.cache.get(cache_key)
+                if cached:
+                    logger.info("✅ LLM 缓存命中: %s", cache_key[:16])
+                    return orjson.loads(cached)
+
+            # provider/模型名/api_base/请求头只依赖配置，由缓存的纯函数一次推导
+            target = _resolve_model_target(provider, model, self.config["base_url"])
             if provider == "custom":
-                provider = "openai"
                 logger.info("📝 检测到 custom provider，转换为 openai 协议格式")
+            provider = target.provider
+            full_model_name = target.model
 
-            # 构建完整的模型名称
-            # 如果是 openai 兼容的第三方服务，通常不需要加 provider 前缀，或者直接用 model 名
-            # LiteLLM 约定：对于 openai 兼容接口，如果 provider 是 openai，可以直接用 model 名
-            # 如果是 anthropic/gemini 等，litellm 通常需要前缀，如 "anthropic/claude-3"
-            # 这里我们做一个简单的处理：如果 provider 不是 openai，且 model 不包含 /，则加上前缀
-
-            full_model_name = model
-            if provider == "openai":
-                normalized_model = model.split("/", 1)[-1]
-                full_model_name = f"openai/{normalized_model}"
-            elif "/" not in model:
-                full_model_name = f"{provider}/{model}"
-            
             # 准备参数
             params = {
                 "model": full_model_name,
@@ -280,13 +373,9 @@ class LLMService:
             if max_tokens:
                 params["max_tokens"] = max_tokens
 
-            # 如果有 base_url (用于 DeepSeek, Moonshot, Local 等)
-            if self.config["base_url"]:
-                api_base = self.config["base_url"].rstrip("/")
-                if provider == "openai" and not api_base.endswith("/v1"):
-                    api_base = f"{api_base}/v1"
-                params["api_base"] = api_base
-            
+            if target.api_base:
+                params["api_base"] = target.api_base
+
             # 如果有 api_version
             if self.config["api_version"]:
                 params["api_version"] = self.config["api_version"]
@@ -295,18 +384,8 @@ class LLMService:
             params.update(kwargs)
 
             # 添加浏览器请求头以绕过中转站 block 检测
-            # 这些请求头模拟真实浏览器访问，避免被反爬虫机制拦截
-            extra_headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Accept": "application/json",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            }
-
-            # 如果有 base_url，添加 Referer 和 Origin
-            if self.config["base_url"]:
-                base_domain = self.config["base_url"].rstrip("/")
-                extra_headers["Referer"] = f"{base_domain}/"
-                extra_headers["Origin"] = base_domain
+            # LiteLLM 可能改写传入的请求头，因此从只读模板复制一份可变字典
+            extra_headers = dict(target.headers)
 
             # 合并用户自定义请求头（如果有）
             if "extra_headers" in kwargs:
@@ -322,21 +401,21 @@ class LLMService:
 
             request_url = self._resolve_request_url(provider, params)
 
-            cache_key = None
-            if use_cache and settings.llm_cache_enabled and self.cache:
-                cache_key = generate_cache_key(messages, self.config["model"], temperature)
-                cached = await self.cache.get(cache_key)
-                if cached:
-                    logger.info("✅ LLM 缓存命中: %s", cache_key[:16])
-                    return json.loads(cached)
-
-            safe_params = params.copy()
-            safe_params["api_key"] = self._mask_api_key(safe_params.get("api_key"))
-            logger.info(
-                "发送 LLM 请求: url=%s, params=%s",
-                request_url or "未推断",
-                safe_params,
-            )
+            # 完整参数（含整段 messages）只在 DEBUG 下复制、脱敏并输出
+            if logger.isEnabledFor(logging.DEBUG):
+                safe_params = params.copy()
+                safe_params["api_key"] = self._mask_api_key(safe_params.get("api_key"))
+                logger.debug(
+                    "发送 LLM 请求: url=%s, params=%s",
+                    request_url or "未推断",
+                    safe_params,
+                )
+            else:
+                logger.info(
+                    "发送 LLM 请求: url=%s, model=%s",
+                    request_url or "未推断",
+                    params["model"],
+                )
 
             # 调用 LiteLLM (异步)
             raw_response = await litellm.acompletion(**params)
@@ -405,7 +484,13 @@ class LLMService:
 
             if use_cache and settings.llm_cache_enabled and self.cache and cache_key:
                 try:
-                    await self.cache.set(cache_key, json.dumps(response), ttl=settings.llm_cache_ttl)
+                    # CacheStorage 约定值为 str（Redis 端按文本读写），这里只做一次解码
+                    serialized = orjson.dumps(
+                        response, option=orjson.OPT_NON_STR_KEYS
+                    ).decode("utf-8")
+                    await self.cache.set(
+                        cache_key, serialized, ttl=settings.llm_cache_ttl
+                    )
                 except Exception as cache_exc:  # noqa: BLE001
                     logger.warning("写入缓存失败: %s", cache_exc)
 
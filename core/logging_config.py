@@ -1,15 +1,40 @@
 """统一日志配置。
 
 - 默认输出到控制台，并可选输出到轮转文件
+- 调用方只把日志记录放入队列，格式化与 I/O 由后台线程完成
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
+_listener: Optional[QueueListener] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """只在调用线程合并消息参数，异常堆栈留给监听线程格式化。
+
+    标准 QueueHandler.prepare 会在调用线程完整格式化记录（包括 traceback），
+    这会让事件循环里的 logger.exception 同步付出堆栈格式化的代价。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> logging.Logger:
     """初始化结构化日志。
@@ -42,9 +67,18 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> loggin
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    # 清理旧 handler，避免重复输出
+    # 重复初始化时先停掉旧监听线程，避免重复输出
+    _stop_listener()
     root.handlers.clear()
-    for h in handlers:
-        root.addHandler(h)
+
+    global _listener
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_DeferredQueueHandler(log_queue))
 
     return root
+
+
+# 进程退出时刷新队列中剩余的日志
+atexit.register(_stop_listener)
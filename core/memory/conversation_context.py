@@ -2,30 +2,40 @@
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from threading import RLock
-from typing import Dict, List, TypedDict
+from threading import Lock
+from typing import Deque, Dict, List, NamedTuple
 import logging
 
+from config.settings import settings
+
 logger = logging.getLogger("core.memory.conversation_context")
 
 
-class ConversationMessage(TypedDict):
-    """会话消息结构。"""
+class ConversationMessage(NamedTuple):
+    """会话消息结构；用 NamedTuple 而非字典，单条消息更省内存。"""
 
     role: str
     content: str
     timestamp: datetime
 
 
+def _history() -> deque:
+    return deque(maxlen=settings.conversation_history_size)
+
+
 @dataclass(slots=True)
 class ConversationSession:
     """玩家会话，存储消息历史。"""
 
     player_name: str
     started_at: datetime
-    messages: List[ConversationMessage] = field(default_factory=list)
+    # 两份历史都是定长环形缓冲，超过 conversation_history_size 时自动丢弃最旧消息
+    messages: Deque[ConversationMessage] = field(default_factory=_history)
+    # 与 messages 同步追加的 LLM 请求格式消息，避免每轮对话重建
+    llm_messages: Deque[Dict[str, str]] = field(default_factory=_history)
 
 
 class ConversationContext:
@@ -33,7 +43,7 @@ class ConversationContext:
 
     def __init__(self) -> None:
         self._sessions: Dict[str, ConversationSession] = {}
-        self._lock = RLock()
+        self._lock = Lock()
 
     def create_session(self, client_id: str, player_name: str) -> ConversationSession:
         """创建/覆盖指定客户端的会话。"""
@@ -67,12 +77,9 @@ class ConversationContext:
                 logger.warning("追加消息时会话不存在，已自动创建: client=%s", client_id)
 
             session.messages.append(
-                {
-                    "role": role,
-                    "content": content,
-                    "timestamp": datetime.now(timezone.utc),
-                }
+                ConversationMessage(role, content, datetime.now(timezone.utc))
             )
+            session.llm_messages.append({"role": role, "content": content})
             logger.debug(
                 "记录会话消息: client=%s, role=%s, len=%s", client_id, role, len(session.messages)
             )
@@ -86,6 +93,15 @@ class ConversationContext:
                 return []
             return list(session.messages)
 
+    def get_llm_history(self, client_id: str) -> List[Dict[str, str]]:
+        """返回可直接拼入 LLM 请求的历史消息（仅含 role/content）。"""
+
+        with self._lock:
+            session = self._sessions.get(client_id)
+            if session is None:
+                return []
+            return list(session.llm_messages)
+
     def clear_session(self, client_id: str) -> None:
         """清理指定客户端会话。"""
 
@@ -5,8 +5,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from fastapi import WebSocket
 
@@ -15,6 +16,9 @@ from core.interfaces import ConnectionManagerInterface
 
 logger = logging.getLogger(__name__)
 
+# 关闭所有连接的总等待上限（秒），避免个别卡死的客户端拖住停机
+CLOSE_ALL_TIMEOUT = 5.0
+
 
 class ConnectionManager(ConnectionManagerInterface):
     """在内存中管理活跃 WebSocket 连接。"""
@@ -37,14 +41,34 @@ class ConnectionManager(ConnectionManagerInterface):
     def count(self) -> int:
         return len(self._connections)
 
+    def pick_target(
+        self, preferred_id: Optional[str] = None
+    ) -> Tuple[str, WebSocket] | None:
+        """选取下发目标：优先使用指定连接，否则取任意一个活跃连接。"""
+        if preferred_id is not None:
+            websocket = self._connections.get(preferred_id)
+            if websocket is not None:
+                return preferred_id, websocket
+        return next(iter(self._connections.items()), None)
+
     async def close_all(self) -> None:
         """优雅关闭所有活跃连接。"""
-        logger.info("正在关闭 %d 个活跃连接...", len(self._connections))
-        for client_id, ws in list(self._connections.items()):
-            try:
-                await ws.close(code=1001, reason="服务端正在关闭")
-                logger.debug("已关闭连接: %s", client_id)
-            except Exception as err:  # noqa: BLE001
-                logger.warning("关闭连接 %s 失败: %s", client_id, err)
+        connections = list(self._connections.items())
+        logger.info("正在关闭 %d 个活跃连接...", len(connections))
+        # 并发关闭，总耗时取决于最慢的客户端而非所有客户端之和
+        closing = asyncio.gather(
+            *(ws.close(code=1001, reason="服务端正在关闭") for _, ws in connections),
+            return_exceptions=True,
+        )
+        try:
+            results = await asyncio.wait_for(closing, timeout=CLOSE_ALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("关闭连接超时（%.1f 秒），剩余连接直接丢弃", CLOSE_ALL_TIMEOUT)
+        else:
+            for (client_id, _), result in zip(connections, results):
+                if isinstance(result, Exception):
+                    logger.warning("关闭连接 %s 失败: %s", client_id, result)
+                else:
+                    logger.debug("已关闭连接: %s", client_id)
         self._connections.clear()
         logger.info("所有连接已关闭")
@@ -1,10 +1,12 @@
 """监控事件总线实现。"""
 
-from typing import Dict, List, Callable, Any
+from typing import Dict, Iterable, List, Callable, Any, Tuple
 from collections import deque
 from datetime import datetime, timezone
+from itertools import count
 from core.monitor.event_types import MonitorEventType
-import uuid
+import secrets
+import time
 
 
 class EventBus:
@@ -13,6 +15,28 @@ class EventBus:
     def __init__(self, history_size: int = 100) -> None:
         self._subscribers: Dict[MonitorEventType, List[Callable[[Dict[str, Any]], None]]] = {}
         self._event_history: deque = deque(maxlen=history_size)
+        # 事件 ID = 实例随机前缀 + 递增序号：只需唯一，不必每条都生成 UUID；
+        # 前缀保证进程重启后 ID 不与旧事件重复，count() 的 next 在 GIL 下是原子的
+        self._id_prefix = secrets.token_hex(4)
+        self._id_seq = count()
+        # (整秒, 该秒的 ISO 前缀)：同一秒内的事件复用前缀，只拼接微秒部分
+        self._ts_cache: Tuple[int, str] = (-1, "")
+
+    def _next_id(self) -> str:
+        return f"{self._id_prefix}-{next(self._id_seq):x}"
+
+    def _utc_timestamp(self) -> str:
+        """当前 UTC 时间的 ISO 8601 字符串，格式与 datetime.isoformat() 一致。"""
+        seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+        cached_seconds, prefix = self._ts_cache
+        if seconds != cached_seconds:
+            naive = datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+            prefix = naive.isoformat()
+            self._ts_cache = (seconds, prefix)
+        # isoformat() 在微秒为 0 时省略小数部分，这里保持相同行为
+        if micros:
+            return f"{prefix}.{micros:06d}+00:00"
+        return f"{prefix}+00:00"
 
     def publish(
         self,
@@ -22,10 +46,10 @@ class EventBus:
     ) -> None:
         """发布事件并通知订阅者。"""
         event = {
-            "id": str(uuid.uuid4()),
+            "id": self._next_id(),
             "type": event_type.value,
             # 使用带时区的 UTC 时间
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._utc_timestamp(),
             "data": data,
             "severity": severity,
         }
@@ -35,6 +59,34 @@ class EventBus:
         for callback in self._subscribers.get(event_type, []):
             callback(event)
 
+    def publish_batch(
+        self,
+        events: Iterable[Tuple[MonitorEventType, Dict[str, Any]]],
+        severity: str = "info",
+    ) -> None:
+        """一次发布多条事件：共用时间戳，历史一次写入后按顺序通知订阅者。"""
+        timestamp = self._utc_timestamp()
+        batch = [
+            (
+                event_type,
+                {
+                    "id": self._next_id(),
+                    "type": event_type.value,
+                    "timestamp": timestamp,
+                    "data": data,
+                    "severity": severity,
+                },
+            )
+            for event_type, data in events
+        ]
+
+        self._event_history.extend(event for _, event in batch)
+
+        subscribers = self._subscribers
+        for event_type, event in batch:
+            for callback in subscribers.get(event_type, []):
+                callback(event)
+
     def subscribe(
         self, event_type: MonitorEventType, callback: Callable[[Dict[str, Any]], None]
     ) -> None:
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Dict
 
@@ -19,15 +18,16 @@ class MessageStatsCollector:
             messages_per_type={},
             last_reset_at=datetime.now(timezone.utc),
         )
-        self._stats.messages_per_type = defaultdict(int)
 
     def record_received(self, message_type: str) -> None:
         self._stats.total_received += 1
-        self._stats.messages_per_type[message_type] += 1
+        counts = self._stats.messages_per_type
+        counts[message_type] = counts.get(message_type, 0) + 1
 
     def record_sent(self, message_type: str) -> None:
         self._stats.total_sent += 1
-        self._stats.messages_per_type[message_type] += 1
+        counts = self._stats.messages_per_type
+        counts[message_type] = counts.get(message_type, 0) + 1
 
     def get_stats(self) -> MessageStats:
         return self._stats
@@ -39,4 +39,3 @@ class MessageStatsCollector:
             messages_per_type={},
             last_reset_at=datetime.now(timezone.utc),
         )
-        self._stats.messages_per_type = defaultdict(int)
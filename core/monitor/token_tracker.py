@@ -21,7 +21,11 @@ class TokenTracker:
         """对比两种格式的 token 消耗并返回统计结果。"""
         standard_json: str = json.dumps(standard_msg, ensure_ascii=False)
         compact_json: str = json.dumps(compact_msg, ensure_ascii=False)
+        return TokenTracker.compare_serialized(standard_json, compact_json)
 
+    @staticmethod
+    def compare_serialized(standard_json: str, compact_json: str) -> Dict[str, Any]:
+        """对比已序列化的两种格式，调用方已持有 JSON 文本时可省去重复编码。"""
         standard_tokens: int = TokenTracker.count_tokens(standard_json)
         compact_tokens: int = TokenTracker.count_tokens(compact_json)
         saved: int = standard_tokens - compact_tokens
@@ -7,37 +7,41 @@ from typing import Dict
 
 from models.monitor import TokenTrendStats, TokenTrendPoint
 
+TREND_HOURS = 24
+
+
+def _epoch_hour(moment: datetime) -> int:
+    """带时区时间所在的小时，以 Unix 纪元起的小时数表示。"""
+    return int(moment.timestamp()) // 3600
+
 
 class TokenUsageTracker:
     """仅负责 token 趋势累积与查询。"""
 
     def __init__(self) -> None:
-        self._trend: Dict[str, int] = {}
+        # 键为 Unix 纪元起的小时数，过期判断只需整数比较
+        self._trend: Dict[int, int] = {}
 
     def record(self, tokens: int) -> None:
-        now = datetime.now(timezone.utc)
-        hour_key = now.strftime("%Y-%m-%d %H:00")
+        hour_key = _epoch_hour(datetime.now(timezone.utc))
         self._trend[hour_key] = self._trend.get(hour_key, 0) + tokens
 
-        cutoff = now - timedelta(hours=24)
-        outdated_keys = [
-            key
-            for key in list(self._trend.keys())
-            if datetime.strptime(key, "%Y-%m-%d %H:00").replace(tzinfo=timezone.utc) < cutoff
-        ]
+        # 只保留 get_trend 会展示的最近 24 个小时
+        cutoff = hour_key - (TREND_HOURS - 1)
+        outdated_keys = [key for key in self._trend if key < cutoff]
         for key in outdated_keys:
             del self._trend[key]
 
     def get_trend(self) -> TokenTrendStats:
         now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        current_hour = _epoch_hour(now)
 
         trend_points = []
         total_tokens = 0
 
-        for offset in range(23, -1, -1):
+        for offset in range(TREND_HOURS - 1, -1, -1):
             hour_dt = now - timedelta(hours=offset)
-            hour_key = hour_dt.strftime("%Y-%m-%d %H:00")
-            tokens = self._trend.get(hour_key, 0)
+            tokens = self._trend.get(current_hour - offset, 0)
             total_tokens += tokens
             trend_points.append(
                 TokenTrendPoint(
@@ -71,23 +71,34 @@ class StoryStore:
     async def append(self, session_id: str, node: dict) -> None:
         """追加单个剧情节点。"""
 
-        payload = orjson.dumps(node).decode("utf-8")
+        await self.append_many(session_id, [node])
+
+    async def append_many(self, session_id: str, nodes: List[dict]) -> None:
+        """在同一连接与事务内批量追加剧情节点。"""
+
+        if not nodes:
+            return
+
         created_at = int(time.time())
+        rows = [
+            (
+                node["id"],
+                session_id,
+                node["timestamp"],
+                node["kind"],
+                node["summary"],
+                orjson.dumps(node).decode("utf-8"),
+                created_at,
+            )
+            for node in nodes
+        ]
 
         async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+            await db.executemany(
                 """
                 INSERT INTO story_nodes (id, session_id, timestamp, kind, summary, node_json, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?);
                 """,
-                (
-                    node["id"],
-                    session_id,
-                    node["timestamp"],
-                    node["kind"],
-                    node["summary"],
-                    payload,
-                    created_at,
-                ),
+                rows,
             )
             await db.commit()
@@ -11,7 +11,7 @@ from pathlib import Path
 from api import websocket, monitor_ws, stats
 from api.routes import llm
 from api.middleware import SecurityHeadersMiddleware
-from api.monitor_ws import register_monitor_subscriptions
+from api.monitor_ws import MonitorBroadcaster, register_monitor_subscriptions
 from api.health import router as health_router
 from core.logging_config import setup_logging
 from config.settings import settings
@@ -42,6 +42,8 @@ async def lifespan(app: FastAPI):
     app.state.connection_manager = ConnectionManager()
     app.state.llm_service = LLMService(cache_storage=cache_storage)
     app.state.conversation_context = ConversationContext()
+    # LLM 配置快照在启动时加载，保存配置时不再读取解析文件
+    await llm.load_settings_snapshot(app)
     # 初始化引擎依赖，失败时保持禁用以便服务可继续运行
     try:
         vision_store = VisionStore()
@@ -54,14 +56,17 @@ async def lifespan(app: FastAPI):
             vision_store=vision_store,
             story_store=story_store,
         )
+        app.state.engine_manager.start()
         logger.info("Engine 会话管理器已启用")
     except Exception as exc:  # noqa: BLE001
         app.state.engine_manager = None
         logger.warning("引擎初始化失败，暂不启用: %s", exc)
 
     logger.info("存储后端: %s", settings.storage_backend)
-    # 注册监控事件订阅，将事件广播到前端监控页面
-    register_monitor_subscriptions(app.state.event_bus)
+    # 注册监控事件订阅，由常驻广播任务将事件推送到前端监控页面
+    app.state.monitor_broadcaster = MonitorBroadcaster()
+    app.state.monitor_broadcaster.start()
+    register_monitor_subscriptions(app.state.event_bus, app.state.monitor_broadcaster)
     yield
 
     # Shutdown: 清理资源
@@ -82,6 +87,8 @@ async def lifespan(app: FastAPI):
         except Exception as exc:  # noqa: BLE001
             logger.warning("关闭 Engine 会话失败: %s", exc)
 
+    await app.state.monitor_broadcaster.stop()
+
     # 2. 关闭缓存存储
     if hasattr(cache_storage, "close"):
         try:
@@ -169,6 +176,8 @@ if __name__ == "__main__":
         access_log=False,
         timeout_keep_alive=5,
         limit_concurrency=100,
+        # 广播帧体积小且同一份文本发给所有监控端，关闭逐连接压缩省 CPU
+        ws_per_message_deflate=False,
     )
     server = uvicorn.Server(config)
 
@@ -192,4 +201,14 @@ if __name__ == "__main__":
         finally:
             sock.close()
 
-    asyncio.run(serve())
+    # uvicorn[standard] 在非 Windows 平台附带 uvloop；由于这里自行驱动 server.serve，
+    # 需显式指定事件循环工厂，缺失时回退到默认 asyncio 循环
+    try:
+        import uvloop
+    except ImportError:
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(serve())
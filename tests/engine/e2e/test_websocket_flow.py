@@ -207,12 +207,11 @@ class TestExistingFeatures:
         }
         # 模拟 conversation_context
         mock_context.conversation_context = MagicMock()
-        mock_context.conversation_context.get_history.return_value = []
+        mock_context.conversation_context.get_llm_history.return_value = []
         mock_context.client_id = "test_client"
 
         await handler.handle(mock_websocket, message, mock_context)
 
         # 验证 LLM 对话正常工作
         mock_context.llm_service.chat_completion.assert_called_once()
-        # ConversationHandler 使用 send_json 而不是 send_text
-        mock_websocket.send_json.assert_called()
+        mock_websocket.send_text.assert_called()
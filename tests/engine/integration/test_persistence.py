@@ -105,6 +105,22 @@ class TestStoryPersistence:
         assert history[0]["id"] == "evt_4"
         assert history[2]["id"] == "evt_2"
 
+    @pytest.mark.asyncio
+    async def test_append_many_and_load_history(self, story_store):
+        """验证批量追加与逐条追加结果一致，空列表为空操作"""
+        session_id = "test_session"
+        nodes = [
+            {"id": f"evt_{i}", "timestamp": 1000 + i, "kind": "observation", "summary": f"事件{i}"}
+            for i in range(3)
+        ]
+
+        await story_store.append_many(session_id, nodes)
+        await story_store.append_many(session_id, [])
+
+        history = await story_store.load_history(session_id, limit=10)
+        assert [node["id"] for node in history] == ["evt_2", "evt_1", "evt_0"]
+        assert history[0] == nodes[2]
+
     @pytest.mark.asyncio
     async def test_load_empty_history(self, story_store):
         """V4: 验证加载空历史返回空列表"""
@@ -2,6 +2,9 @@
 
 import pytest
 import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 import orjson
 from core.engine.manager import EngineSessionManager
@@ -111,3 +114,23 @@ class TestEngineSessionManager:
 
         # 验证 session2 不受影响
         assert session2.initialized is True
+
+    @pytest.mark.asyncio
+    async def test_cleanup_idle_closes_only_expired(self, manager, monkeypatch):
+        """验证仅关闭超时会话，期间活跃过的会话保留并按新时间重新入堆"""
+        stale = await manager.get_or_create("session_1", "char_1", {}, {})
+        active = await manager.get_or_create("session_2", "char_2", {}, {})
+        stale.close = MagicMock()
+
+        # 模拟 45 分钟后清理，session_2 在 40 分钟时有过活动
+        later = time.monotonic() + 45 * 60
+        active.last_active_mono = later - 5 * 60
+        clock = SimpleNamespace(monotonic=lambda: later)
+        monkeypatch.setattr("core.engine.manager.time", clock)
+
+        await manager.cleanup_idle(timedelta(minutes=30))
+
+        stale.close.assert_called_once()
+        assert manager.get("session_1") is None
+        assert manager.get("session_2") is active
+        assert manager._expiry_heap == [(active.last_active_mono, "session_2")]
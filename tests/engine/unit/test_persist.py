@@ -0,0 +1,77 @@
+"""测试后台持久化写入任务"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.engine.persist import PersistWorker, write_session_state
+from core.storage.story import StoryStore
+from core.storage.vision import VisionStore
+
+
+@pytest.fixture
+def stores():
+    """模拟存储层"""
+    return AsyncMock(spec=VisionStore), AsyncMock(spec=StoryStore)
+
+
+class TestWriteSessionState:
+    @pytest.mark.asyncio
+    async def test_writes_snapshot_and_events(self, stores):
+        """快照与剧情节点都应写入，剧情节点走批量接口"""
+        vision_store, story_store = stores
+        events = [{"id": "s1"}]
+
+        await write_session_state(vision_store, story_store, "s", {"tick": 1}, 1, events)
+
+        vision_store.save.assert_awaited_once_with("s", {"tick": 1}, 1)
+        story_store.append_many.assert_awaited_once_with("s", events)
+
+    @pytest.mark.asyncio
+    async def test_skips_empty_parts(self, stores):
+        """无快照、无剧情节点时不应访问存储"""
+        vision_store, story_store = stores
+
+        await write_session_state(vision_store, story_store, "s", None, 0, [])
+
+        vision_store.save.assert_not_awaited()
+        story_store.append_many.assert_not_awaited()
+
+
+class TestPersistWorker:
+    @pytest.mark.asyncio
+    async def test_submit_before_start_is_rejected(self, stores):
+        """未启动时 submit 返回 False，由调用方当场写入"""
+        worker = PersistWorker(*stores)
+
+        assert await worker.submit("s", None, 0, []) is False
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queue_in_order(self, stores):
+        """stop 前排队的写入都应按顺序完成"""
+        vision_store, story_store = stores
+        worker = PersistWorker(vision_store, story_store)
+        worker.start()
+
+        for tick in range(3):
+            assert await worker.submit("s", {"tick": tick}, tick, []) is True
+        await worker.stop()
+
+        ticks = [c.args[2] for c in vision_store.save.await_args_list]
+        assert ticks == [0, 1, 2]
+        assert await worker.submit("s", None, 0, []) is False
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_stop_worker(self, stores):
+        """单次写入失败后任务应继续处理后续写入"""
+        vision_store, story_store = stores
+        vision_store.save.side_effect = [RuntimeError("disk"), None]
+        worker = PersistWorker(vision_store, story_store)
+        worker.start()
+
+        await worker.submit("s", {"tick": 1}, 1, [])
+        await worker.submit("s", {"tick": 2}, 2, [])
+        await asyncio.wait_for(worker.stop(), timeout=1)
+
+        assert vision_store.save.await_count == 2
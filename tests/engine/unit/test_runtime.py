@@ -59,6 +59,38 @@ class TestWASMRuntime:
         finally:
             handle.close()
 
+    def test_bytes_input_matches_str_input(self, runtime, simple_config):
+        """bytes 输入应与 str 输入得到相同输出（跳过 decode/encode 往返）"""
+        event = orjson.dumps({"type": "player_message", "player_id": "p", "text": "你好"})
+        str_handle = runtime.create_engine(orjson.dumps(simple_config).decode("utf-8"))
+        bytes_handle = runtime.create_engine(orjson.dumps(simple_config))
+
+        try:
+            assert runtime.process(bytes_handle, event) == runtime.process(
+                str_handle, event.decode("utf-8")
+            )
+        finally:
+            str_handle.close()
+            bytes_handle.close()
+
+    def test_memory_cache_follows_growth(self, runtime, simple_config):
+        """缓存的内存长度应随 memory.grow 更新，大输入扩容后仍能正常处理"""
+        handle = runtime.create_engine(orjson.dumps(simple_config))
+
+        try:
+            assert handle.mem_len == handle.memory.data_len(handle.store)
+            before = handle.mem_len
+            text = "长" * before  # UTF-8 下约 3 倍于当前内存，必然触发扩容
+            event = orjson.dumps({"type": "player_message", "player_id": "p", "text": text})
+
+            outputs = runtime.process(handle, event)
+
+            assert handle.mem_len > before
+            assert handle.mem_len == handle.memory.data_len(handle.store)
+            assert all(isinstance(orjson.loads(line), dict) for line in outputs)
+        finally:
+            handle.close()
+
     def test_tick_method(self, runtime, simple_config):
         """V1: 验证 tick() 方法调用"""
         config_json = orjson.dumps(simple_config).decode("utf-8")
@@ -3,7 +3,12 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 import orjson
-from core.engine.session import EngineSession
+from core.engine.persist import PersistWorker
+from core.engine.session import (
+    EngineSession,
+    _normalize_vision,
+    _normalize_world_diff,
+)
 from core.engine.runtime import WASMRuntime, EngineHandle
 from core.storage.vision import VisionStore
 from core.storage.story import StoryStore
@@ -113,7 +118,8 @@ class TestEngineSession:
 
         # V4: 验证持久化调用
         vision_store.save.assert_called_once()
-        story_store.append.assert_called_once()
+        story_store.append_many.assert_called_once()
+        assert len(story_store.append_many.call_args[0][1]) == 1
 
     @pytest.mark.asyncio
     async def test_orjson_used_throughout(self, mock_runtime, mock_stores):
@@ -143,3 +149,68 @@ class TestEngineSession:
 
         # 验证 handle.close() 被调用
         mock_handle.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_world_change_envelope_matches_dict_encoding(
+        self, mock_runtime, mock_stores
+    ):
+        """拼接的 world_change 信封应与序列化完整字典的结果一致"""
+        vision_store, story_store = mock_stores
+        session = EngineSession(session_id="test_session_6", character_id="char_6")
+        await session.initialize(mock_runtime, vision_store, story_store, {}, {})
+
+        diff = {"tick": 5, "timestamp_ms": 1, "vision": {"tick": 5}}
+        await session.on_world_diff(mock_runtime, vision_store, story_store, diff)
+
+        sent = mock_runtime.process.call_args[0][1]
+        expected = {
+            "type": "event",
+            "kind": "world_change",
+            "data": _normalize_world_diff(diff),
+        }
+        assert sent == orjson.dumps(expected)
+
+    @pytest.mark.asyncio
+    async def test_world_diff_persists_through_worker(self, mock_runtime, mock_stores):
+        """注入已启动的持久化任务后，写入在后台完成且结果不变"""
+        vision_store, story_store = mock_stores
+        persister = PersistWorker(vision_store, story_store)
+        persister.start()
+        session = EngineSession(
+            session_id="test_session_7", character_id="char_7", persister=persister
+        )
+        await session.initialize(mock_runtime, vision_store, story_store, {}, {})
+
+        outputs = await session.on_world_diff(
+            mock_runtime, vision_store, story_store, {"vision": {}, "tick": 3}
+        )
+        await persister.stop()
+
+        assert [o["type"] for o in outputs] == ["mod_action"]
+        vision_store.save.assert_awaited_once()
+        assert vision_store.save.await_args.args[0] == "test_session_7"
+        assert vision_store.save.await_args.args[2] == 3
+        story_store.append_many.assert_awaited_once()
+
+
+class TestNormalizeVision:
+    def test_complete_snapshot_is_reused(self):
+        """字段齐全的快照应原样返回，不重建"""
+        vision = {"entities": [], "blocks": [], "environment": {}, "tick": 1}
+
+        assert _normalize_vision(vision) is vision
+
+    def test_partial_snapshot_is_filled(self):
+        """缺字段或多余字段时按协议重建"""
+        result = _normalize_vision({"tick": 2, "extra": True})
+
+        assert result == {
+            "entities": [],
+            "blocks": [],
+            "environment": {
+                "time_of_day": 6000,
+                "weather": "clear",
+                "biome": "minecraft:plains",
+            },
+            "tick": 2,
+        }
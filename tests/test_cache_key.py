@@ -1,7 +1,5 @@
 """测试 LLM 缓存键生成。"""
 
-import hashlib
-
 from core.llm.cache import generate_cache_key
 
 
@@ -11,8 +9,8 @@ def test_generate_cache_key_stable():
     key2 = generate_cache_key(messages, "gpt-4", 0.7)
     assert key1 == key2
     assert key1.startswith("llm:cache:")
-    # 校验长度（sha256）
-    assert len(key1.split(":")[-1]) == len(hashlib.sha256().hexdigest())
+    # 校验长度（blake2b 128 位摘要）
+    assert len(key1.split(":")[-1]) == 32
 
 
 def test_generate_cache_key_diff_by_model():
@@ -20,3 +18,9 @@ def test_generate_cache_key_diff_by_model():
     k1 = generate_cache_key(messages, "gpt-4", 0.7)
     k2 = generate_cache_key(messages, "gpt-3.5-turbo", 0.7)
     assert k1 != k2
+
+
+def test_generate_cache_key_ignores_key_order():
+    m1 = [{"role": "user", "content": "你好"}]
+    m2 = [{"content": "你好", "role": "user"}]
+    assert generate_cache_key(m1, "gpt-4", 0.7) == generate_cache_key(m2, "gpt-4", 0.7)
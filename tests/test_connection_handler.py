@@ -3,7 +3,7 @@ Unit tests for api/handlers/connection.py (Connection Init Handler)
 
 Tests the connection initialization handler including:
 - Connection acknowledgment response
-- WebSocket send_json call
+- WebSocket send_text call
 - Metrics recording
 - Event bus publishing
 - Response format validation
@@ -24,7 +24,7 @@ from core.monitor.event_types import MonitorEventType
 def mock_websocket():
     """Create mock WebSocket"""
     ws = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
@@ -53,11 +53,11 @@ class TestConnectionInitHandler:
 
         await handler.handle(mock_websocket, message, mock_context)
 
-        # Verify send_json was called once
-        mock_websocket.send_json.assert_called_once()
+        # Verify send_text was called once
+        mock_websocket.send_text.assert_called_once()
 
         # Verify response structure
-        call_args = mock_websocket.send_json.call_args[0][0]
+        call_args = json.loads(mock_websocket.send_text.call_args[0][0])
         assert call_args["type"] == "connection_ack"
         assert call_args["data"]["client_id"] == "test-client-123"
         assert "timestamp" in call_args
@@ -0,0 +1,82 @@
+"""
+Unit tests for core/monitor/connection_manager.py (ConnectionManager)
+
+Tests the target selection used by /api/ws/send-json including:
+- Preferred connection lookup
+- Fallback to any active connection
+- Empty manager
+- Concurrent close_all with failures and a timeout
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from core.monitor import connection_manager
+from core.monitor.connection_manager import ConnectionManager
+
+
+class TestPickTarget:
+    """Tests for ConnectionManager.pick_target"""
+
+    def test_returns_preferred_connection(self):
+        """Should return the preferred connection when it is active"""
+        manager = ConnectionManager()
+        first, preferred = Mock(), Mock()
+        manager.add("mod-1", first)
+        manager.add("mod-2", preferred)
+
+        assert manager.pick_target("mod-2") == ("mod-2", preferred)
+
+    def test_falls_back_to_any_connection(self):
+        """Should fall back to an active connection when preferred is missing"""
+        manager = ConnectionManager()
+        websocket = Mock()
+        manager.add("mod-1", websocket)
+
+        assert manager.pick_target("gone") == ("mod-1", websocket)
+        assert manager.pick_target(None) == ("mod-1", websocket)
+
+    def test_returns_none_without_connections(self):
+        """Should return None when nothing is connected"""
+        assert ConnectionManager().pick_target("mod-1") is None
+
+
+class TestCloseAll:
+    """Tests for ConnectionManager.close_all"""
+
+    @pytest.mark.asyncio
+    async def test_closes_every_connection_despite_failures(self):
+        """A failing close should not stop the others"""
+        manager = ConnectionManager()
+        healthy, broken = AsyncMock(), AsyncMock()
+        broken.close.side_effect = RuntimeError("gone")
+        manager.add("mod-1", broken)
+        manager.add("mod-2", healthy)
+
+        await manager.close_all()
+
+        healthy.close.assert_awaited_once_with(code=1001, reason="服务端正在关闭")
+        broken.close.assert_awaited_once()
+        assert manager.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_is_bounded_by_timeout(self, monkeypatch):
+        """A client that never finishes closing should not block shutdown"""
+        monkeypatch.setattr(connection_manager, "CLOSE_ALL_TIMEOUT", 0.01)
+        manager = ConnectionManager()
+        closing = asyncio.Event()
+
+        async def stall(**_):
+            closing.set()
+            await asyncio.sleep(10)
+
+        stalled = AsyncMock()
+        stalled.close.side_effect = stall
+        manager.add("mod-1", stalled)
+
+        await manager.close_all()
+
+        assert closing.is_set()
+        assert manager.count() == 0
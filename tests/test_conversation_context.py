@@ -0,0 +1,44 @@
+"""
+Unit tests for core/memory/conversation_context.py (ConversationContext)
+
+Tests the per-player conversation history including:
+- Bounded message history per session
+- LLM history kept in step with the full history
+"""
+
+from core.memory import conversation_context
+from core.memory.conversation_context import ConversationContext
+
+
+class TestConversationContext:
+    """Tests for ConversationContext history"""
+
+    def test_history_keeps_most_recent_messages(self, monkeypatch):
+        """Oldest messages should drop once the session is full"""
+        monkeypatch.setattr(
+            conversation_context.settings, "conversation_history_size", 3
+        )
+        context = ConversationContext()
+        context.create_session("c1", "Steve")
+
+        for index in range(5):
+            context.add_message("c1", "user", f"m{index}")
+
+        assert [m.content for m in context.get_history("c1")] == ["m2", "m3", "m4"]
+        assert context.get_llm_history("c1") == [
+            {"role": "user", "content": "m2"},
+            {"role": "user", "content": "m3"},
+            {"role": "user", "content": "m4"},
+        ]
+
+    def test_history_is_a_list_snapshot(self):
+        """get_history should return a list detached from the session buffer"""
+        context = ConversationContext()
+        context.add_message("c1", "user", "hi", player_name="Steve")
+
+        history = context.get_history("c1")
+        context.add_message("c1", "assistant", "hello")
+
+        assert isinstance(history, list)
+        assert len(history) == 1
+        assert (history[0].role, history[0].content) == ("user", "hi")
@@ -25,7 +25,7 @@ from core.monitor.event_types import MonitorEventType
 def mock_websocket():
     """Create mock WebSocket"""
     ws = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
@@ -55,7 +55,7 @@ def mock_context():
 
     # Conversation context
     context.conversation_context = Mock()
-    context.conversation_context.get_history = Mock(return_value=[])
+    context.conversation_context.get_llm_history = Mock(return_value=[])
     context.conversation_context.add_message = Mock()
 
     return context
@@ -83,7 +83,7 @@ class TestConversationHandler:
             }
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -123,7 +123,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr", "m": "I'm good!"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 50,
                     "compact_tokens": 40,
                 }
@@ -163,18 +163,18 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
 
                 await handler.handle(mock_websocket, message, mock_context)
 
-        # Verify send_json was called
-        mock_websocket.send_json.assert_called_once()
+        # Verify send_text was called
+        mock_websocket.send_text.assert_called_once()
 
         # Verify response structure
-        call_args = mock_websocket.send_json.call_args[0][0]
+        call_args = json.loads(mock_websocket.send_text.call_args[0][0])
         assert call_args["type"] == "conversation_response"
         assert call_args["id"] == "msg-789"
         assert call_args["companionName"] == "TestCompanion"
@@ -197,7 +197,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -223,7 +223,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -252,7 +252,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -286,7 +286,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -310,7 +310,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 100,
                     "compact_tokens": 80,
                 }
@@ -333,7 +333,7 @@ class TestConversationHandler:
             mock_protocol.compact.return_value = {"t": "cr"}
 
             with patch("api.handlers.conversation.TokenTracker") as mock_tracker:
-                mock_tracker.compare.return_value = {
+                mock_tracker.compare_serialized.return_value = {
                     "standard_tokens": 150,
                     "compact_tokens": 120,
                 }
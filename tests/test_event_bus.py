@@ -11,6 +11,7 @@ Tests the pub/sub event dispatching system including:
 """
 
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
@@ -66,7 +67,7 @@ class TestEventBus:
 
         # Validate event structure
         assert isinstance(event["id"], str)
-        assert len(event["id"]) > 0  # UUID should not be empty
+        assert len(event["id"]) > 0  # ID should not be empty
         # MonitorEventType.value returns the actual value (e.g., "MESSAGE_RECEIVED" or "message_received")
         assert event["type"] == MonitorEventType.MESSAGE_RECEIVED.value
         assert isinstance(event["timestamp"], str)
@@ -243,3 +244,60 @@ class TestEventBus:
         history = bus.get_recent_events(limit=1)
         assert len(history) == 1
         assert history[0]["type"] == MonitorEventType.FRONTEND_CONNECTED.value
+
+    def test_publish_batch_records_and_notifies_in_order(self):
+        """Should record every event and notify subscribers in batch order"""
+        bus = EventBus()
+        seen = []
+        bus.subscribe(MonitorEventType.MESSAGE_RECEIVED, seen.append)
+        bus.subscribe(MonitorEventType.MESSAGE_SENT, seen.append)
+
+        bus.publish_batch(
+            [
+                (MonitorEventType.MESSAGE_RECEIVED, {"n": 1}),
+                (MonitorEventType.MESSAGE_SENT, {"n": 2}),
+            ]
+        )
+
+        history = bus.get_recent_events()
+        assert [e["data"]["n"] for e in history] == [1, 2]
+        assert seen == history
+        assert history[0]["timestamp"] == history[1]["timestamp"]
+        assert history[0]["id"] != history[1]["id"]
+
+    def test_publish_batch_empty_is_noop(self):
+        """Should accept an empty batch"""
+        bus = EventBus()
+
+        bus.publish_batch([])
+
+        assert bus.get_recent_events() == []
+
+    def test_event_ids_unique_across_instances(self):
+        """IDs should not repeat within a bus or across bus instances"""
+        first, second = EventBus(), EventBus()
+
+        for bus in (first, second):
+            for _ in range(3):
+                bus.publish(MonitorEventType.MESSAGE_SENT, {})
+
+        ids = [e["id"] for bus in (first, second) for e in bus.get_recent_events()]
+        assert len(set(ids)) == 6
+
+    @pytest.mark.parametrize(
+        "ns", [1_700_000_000_123_456_789, 1_700_000_001_000_000_000]
+    )
+    def test_timestamp_matches_isoformat(self, monkeypatch, ns):
+        """Cached timestamps should match datetime.isoformat()"""
+        import core.monitor.event_bus as event_bus_module
+
+        fake_time = SimpleNamespace(time_ns=lambda: ns)
+        monkeypatch.setattr(event_bus_module, "time", fake_time)
+        bus = EventBus()
+
+        bus.publish(MonitorEventType.MESSAGE_SENT, {})
+        bus.publish(MonitorEventType.MESSAGE_SENT, {})
+
+        expected = datetime.fromtimestamp(ns // 1000 / 1_000_000, timezone.utc)
+        history = bus.get_recent_events()
+        assert [e["timestamp"] for e in history] == [expected.isoformat()] * 2
@@ -4,7 +4,7 @@ Unit tests for api/handlers/game_state.py (Game State Handler)
 Tests the game state update handler including:
 - Game state acknowledgment response
 - Player name extraction
-- WebSocket send_json call
+- WebSocket send_text call
 - Metrics recording
 - Event bus publishing
 - Response format validation
@@ -25,7 +25,7 @@ from core.monitor.event_types import MonitorEventType
 def mock_websocket():
     """Create mock WebSocket"""
     ws = AsyncMock()
-    ws.send_json = AsyncMock()
+    ws.send_text = AsyncMock()
     return ws
 
 
@@ -57,11 +57,11 @@ class TestGameStateHandler:
 
         await handler.handle(mock_websocket, message, mock_context)
 
-        # Verify send_json was called once
-        mock_websocket.send_json.assert_called_once()
+        # Verify send_text was called once
+        mock_websocket.send_text.assert_called_once()
 
         # Verify response structure
-        call_args = mock_websocket.send_json.call_args[0][0]
+        call_args = json.loads(mock_websocket.send_text.call_args[0][0])
         assert call_args["type"] == "game_state_ack"
         assert call_args["data"]["status"] == "received"
         assert call_args["data"]["player"] == "Steve"
@@ -0,0 +1,90 @@
+"""
+Unit tests for api/routes/llm.py (POST /api/llm/config)
+
+Tests the settings.json snapshot used by save_llm_config including:
+- Other sections preserved when saving
+- Malformed files rejected without being overwritten
+- External edits picked up before the next save
+"""
+
+import os
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import llm as llm_routes
+
+PAYLOAD = {"provider": "openai", "model": "gpt-4", "apiKey": "k", "baseUrl": ""}
+
+
+@pytest.fixture
+def settings_path(tmp_path, monkeypatch):
+    """Point SETTINGS_PATH at a temporary file"""
+    path = tmp_path / "settings.json"
+    monkeypatch.setattr(llm_routes, "SETTINGS_PATH", path)
+    return path
+
+
+@pytest.fixture
+def client():
+    """App with only the LLM router and a stub LLM service"""
+    app = FastAPI()
+    app.include_router(llm_routes.router)
+    app.state.llm_service = SimpleNamespace(config={})
+    return TestClient(app)
+
+
+class TestSaveLLMConfig:
+    """Tests for save_llm_config and the settings snapshot"""
+
+    def test_save_keeps_other_sections(self, settings_path, client):
+        """Only the llm section should change"""
+        settings_path.write_bytes(b'{"llm": {"extra": 1}, "other": {"keep": 1}}')
+
+        response = client.post("/api/llm/config", json=PAYLOAD)
+
+        assert response.status_code == 200
+        saved = orjson.loads(settings_path.read_bytes())
+        assert saved["other"] == {"keep": 1}
+        assert saved["llm"]["extra"] == 1
+        assert saved["llm"]["model"] == "gpt-4"
+
+    @pytest.mark.parametrize(
+        "content",
+        [b'{"llm": {}, "other": {"keep": 1},}', b'["not", "an", "object"]'],
+    )
+    def test_malformed_file_is_not_overwritten(self, settings_path, client, content):
+        """Saving over an unreadable file should fail and leave it intact"""
+        settings_path.write_bytes(content)
+
+        response = client.post("/api/llm/config", json=PAYLOAD)
+
+        assert response.status_code == 500
+        assert settings_path.read_bytes() == content
+
+    def test_external_edit_is_reloaded(self, settings_path, client):
+        """Edits made on disk after a save should survive the next save"""
+        settings_path.write_bytes(b'{"llm": {}}')
+        client.post("/api/llm/config", json=PAYLOAD)
+
+        settings_path.write_bytes(b'{"llm": {}, "other": {"keep": 1}}')
+        # Make sure the mtime differs even on coarse-grained filesystems
+        stat = settings_path.stat()
+        os.utime(settings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        response = client.post("/api/llm/config", json=PAYLOAD)
+
+        assert response.status_code == 200
+        assert orjson.loads(settings_path.read_bytes())["other"] == {"keep": 1}
+
+    @pytest.mark.asyncio
+    async def test_startup_load_skips_malformed_file(self, settings_path):
+        """A malformed file at startup should leave no snapshot cached"""
+        settings_path.write_bytes(b"{oops")
+        app = FastAPI()
+
+        await llm_routes.load_settings_snapshot(app)
+
+        assert getattr(app.state, "settings", None) is None
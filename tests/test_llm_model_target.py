@@ -0,0 +1,34 @@
+"""覆盖 _resolve_model_target 的配置推导逻辑。"""
+
+from core.llm.service import _resolve_model_target
+
+
+def test_custom_provider_uses_openai_protocol():
+    """custom provider 应转为 openai，并补全 /v1 与来源请求头。"""
+
+    target = _resolve_model_target("custom", "vendor/chat", "https://relay.example/")
+
+    assert target.provider == "openai"
+    assert target.model == "openai/chat"
+    assert target.api_base == "https://relay.example/v1"
+    assert target.headers["Referer"] == "https://relay.example/"
+    assert target.headers["Origin"] == "https://relay.example"
+
+
+def test_other_provider_gets_prefix_without_base_url():
+    """非 openai provider 应加前缀，无 base_url 时不带 api_base 与来源请求头。"""
+
+    target = _resolve_model_target("anthropic", "claude-3", "")
+
+    assert target.model == "anthropic/claude-3"
+    assert target.api_base is None
+    assert "Referer" not in target.headers
+
+
+def test_result_is_cached_per_config():
+    """相同配置复用同一结果，配置变化时重新推导。"""
+
+    first = _resolve_model_target("openai", "gpt-4", "")
+
+    assert _resolve_model_target("openai", "gpt-4", "") is first
+    assert _resolve_model_target("openai", "gpt-4o", "") is not first
@@ -120,3 +120,25 @@ def test_response_to_dict_with_non_serializable():
     payload = NonSerializablePayload()
     with pytest.raises(ValueError, match="序列化"):
         LLMService._response_to_dict(payload)
+
+
+def test_response_to_dict_with_model_response():
+    """验证 LiteLLM ModelResponse 走类型分派并转成字典。"""
+
+    from litellm import ModelResponse
+
+    result = LLMService._response_to_dict(ModelResponse(id="resp-1"))
+
+    assert isinstance(result, dict)
+    assert result["id"] == "resp-1"
+
+
+def test_response_to_dict_with_dict_subclass():
+    """验证 dict 子类不在分派表中时仍按字典原样返回。"""
+
+    class Payload(dict):
+        pass
+
+    payload = Payload(ok=True)
+
+    assert LLMService._response_to_dict(payload) is payload
@@ -150,12 +150,13 @@ class TestMessageStatsCollector:
         stats2 = collector.get_stats()
         assert stats2.total_received == 999  # Current implementation returns reference
 
-    def test_messages_per_type_is_defaultdict(self):
-        """Should use defaultdict for messages_per_type (returns 0 for missing keys)"""
+    def test_messages_per_type_is_plain_dict(self):
+        """Should keep messages_per_type a plain dict without phantom keys"""
         collector = MessageStatsCollector()
+        collector.record_received("conversation_request")
 
         stats = collector.get_stats()
 
-        # Accessing non-existent key should return 0 (defaultdict behavior)
-        # Note: After get_stats(), messages_per_type is a defaultdict
+        assert type(stats.messages_per_type) is dict
         assert stats.messages_per_type.get("nonexistent_type", 0) == 0
+        assert "nonexistent_type" not in stats.messages_per_type
@@ -0,0 +1,138 @@
+"""
+Unit tests for api/monitor_ws.py (Monitor broadcast)
+
+Tests the monitor event broadcast including:
+- Single encoding shared by all clients
+- Removal of clients whose send fails
+- Batched sending for large client lists
+- MonitorBroadcaster queue bridge (same-thread and cross-thread publish)
+"""
+
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from api import monitor_ws
+from core.monitor.event_types import MonitorEventType
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    """Register two mock monitor clients for the duration of a test"""
+    healthy = AsyncMock()
+    broken = AsyncMock()
+    broken.send_text.side_effect = RuntimeError("closed")
+    monkeypatch.setattr(monitor_ws, "active_monitor_clients", [healthy, broken])
+    return healthy, broken
+
+
+class TestBroadcastEventToMonitors:
+    """Tests for broadcast_event_to_monitors"""
+
+    @pytest.mark.asyncio
+    async def test_sends_event_envelope_to_all_clients(self, clients):
+        """Every client should receive the same event frame"""
+        healthy, broken = clients
+        event = {"id": "1", "type": "message_sent", "data": {"client_id": "c"}}
+
+        await monitor_ws.broadcast_event_to_monitors(event)
+
+        sent = healthy.send_text.call_args[0][0]
+        assert json.loads(sent) == {"type": "event", "event": event}
+        assert broken.send_text.call_args[0][0] is sent
+
+    @pytest.mark.asyncio
+    async def test_removes_failed_clients(self, clients):
+        """Clients whose send raises should be dropped"""
+        healthy, broken = clients
+        snapshot = monitor_ws.active_monitor_clients
+
+        await monitor_ws.broadcast_event_to_monitors({"id": "1"})
+
+        assert monitor_ws.active_monitor_clients == [healthy]
+        # The old list is never mutated, so in-flight broadcasts keep their snapshot
+        assert snapshot == [healthy, broken]
+
+    @pytest.mark.asyncio
+    async def test_no_clients_is_noop(self, monkeypatch):
+        """Broadcasting without clients should not fail"""
+        monkeypatch.setattr(monitor_ws, "active_monitor_clients", [])
+
+        await monitor_ws.broadcast_event_to_monitors({"id": "1"})
+
+    @pytest.mark.asyncio
+    async def test_large_broadcast_is_batched(self, monkeypatch):
+        """Clients beyond one batch should still all receive the event"""
+        monkeypatch.setattr(monitor_ws, "BROADCAST_BATCH_SIZE", 2)
+        many = [AsyncMock() for _ in range(5)]
+        monkeypatch.setattr(monitor_ws, "active_monitor_clients", many)
+
+        await monitor_ws.broadcast_event_to_monitors({"id": "1"})
+
+        assert all(client.send_text.await_count == 1 for client in many)
+
+
+@pytest.fixture
+async def broadcaster(monkeypatch):
+    """Start a MonitorBroadcaster with a mocked broadcast function"""
+    broadcast = AsyncMock()
+    monkeypatch.setattr(monitor_ws, "broadcast_event_to_monitors", broadcast)
+    monkeypatch.setattr(monitor_ws, "active_monitor_clients", [AsyncMock()])
+    instance = monitor_ws.MonitorBroadcaster()
+    instance.start()
+    yield instance, broadcast
+    await instance.stop()
+
+
+class TestMonitorBroadcaster:
+    """Tests for MonitorBroadcaster"""
+
+    @pytest.mark.asyncio
+    async def test_enqueued_events_are_broadcast_in_order(self, broadcaster):
+        """Events should be forwarded to the broadcast function in order"""
+        instance, broadcast = broadcaster
+
+        instance.enqueue({"id": "1"})
+        instance.enqueue({"id": "2"})
+        await asyncio.sleep(0.01)
+
+        assert [c.args[0]["id"] for c in broadcast.await_args_list] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_from_other_thread(self, broadcaster):
+        """Events published from a worker thread should reach the loop"""
+        instance, broadcast = broadcaster
+
+        worker = threading.Thread(target=instance.enqueue, args=({"id": "t"},))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0.01)
+
+        broadcast.assert_awaited_once_with({"id": "t"})
+
+    @pytest.mark.asyncio
+    async def test_skips_queue_without_monitors(self, broadcaster, monkeypatch):
+        """No monitor clients means nothing is queued"""
+        instance, broadcast = broadcaster
+        monkeypatch.setattr(monitor_ws, "active_monitor_clients", [])
+
+        instance.enqueue({"id": "1"})
+        await asyncio.sleep(0.01)
+
+        broadcast.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_register_subscribes_every_event_type(self, broadcaster):
+        """Every MonitorEventType should be routed to the broadcaster"""
+        instance, _ = broadcaster
+        event_bus = MagicMock()
+
+        monitor_ws.register_monitor_subscriptions(event_bus, instance)
+
+        subscribed = {c.args[0] for c in event_bus.subscribe.call_args_list}
+        assert subscribed == set(MonitorEventType)
+        callbacks = {id(c.args[1]) for c in event_bus.subscribe.call_args_list}
+        assert len(callbacks) == 1
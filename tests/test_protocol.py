@@ -0,0 +1,127 @@
+"""
+Unit tests for api/protocol.py (CompactProtocol)
+
+Tests the specialized parser against the generic parse:
+- Compact short keys
+- Long keys and aliases
+- Legacy data-nested messages
+"""
+
+import pytest
+
+from api.protocol import CompactProtocol
+
+
+@pytest.fixture
+def parse_conversation():
+    return CompactProtocol.build_specialized("conversation_request")
+
+
+class TestBuildSpecialized:
+    """Tests for CompactProtocol.build_specialized"""
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            {"t": "cr", "i": "1", "p": "Steve", "c": "Alex", "m": "hi"},
+            {
+                "type": "conversation_request",
+                "id": "2",
+                "playerName": "Steve",
+                "companionName": "Alex",
+                "message": "hello",
+                "timestamp": 123,
+            },
+            {"type": "cr", "data": {"player_name": "Steve", "msg": "legacy"}},
+        ],
+    )
+    def test_matches_generic_parse(self, parse_conversation, message):
+        """Should produce the same schema fields as CompactProtocol.parse"""
+        assert parse_conversation(message) == CompactProtocol.parse(message)
+
+    def test_top_level_overrides_data(self, parse_conversation):
+        """Top-level fields should win over legacy data fields"""
+        message = {"t": "cr", "m": "top", "data": {"message": "nested"}}
+
+        result = parse_conversation(message)
+
+        assert result["message"] == "top"
+        assert result["type"] == "conversation_request"
+
+    def test_ignores_fields_outside_schema(self, parse_conversation):
+        """Unknown fields should be dropped"""
+        result = parse_conversation({"t": "cr", "extra": 1})
+
+        assert result == {"type": "conversation_request"}
+
+    def test_rejects_non_dict(self, parse_conversation):
+        """Non-dict input should raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_conversation(["not", "a", "dict"])
+
+    def test_unknown_schema_raises(self):
+        """Unknown schema names should raise KeyError"""
+        with pytest.raises(KeyError):
+            CompactProtocol.build_specialized("no_such_schema")
+
+
+class TestEngineFieldAliases:
+    """Tests for camelCase engine field normalization"""
+
+    def test_camel_case_engine_fields_normalized(self):
+        """camelCase engine fields should map to snake_case"""
+        message = {
+            "type": "engine_init",
+            "sessionId": "s1",
+            "characterId": "c1",
+            "characterCard": {"name": "Alex"},
+            "playerId": "p1",
+        }
+
+        result = CompactProtocol.parse(message)
+
+        assert result["session_id"] == "s1"
+        assert result["character_id"] == "c1"
+        assert result["character_card"] == {"name": "Alex"}
+        assert result["player_id"] == "p1"
+        assert "sessionId" not in result
+
+
+class TestRoundTrip:
+    """Tests for compact/parse compatibility"""
+
+    def test_compact_then_parse_restores_standard_response(self):
+        """parse(compact(x)) should return the standard response unchanged"""
+        standard = {
+            "type": "conversation_response",
+            "playerName": "Steve",
+            "message": "你好",
+            "action": [],
+        }
+
+        assert CompactProtocol.parse(CompactProtocol.compact(standard)) == standard
+
+
+class TestParseFastPath:
+    """Tests for the already-standard fast path in CompactProtocol.parse"""
+
+    def test_standard_message_returns_equal_copy(self):
+        """Standard messages should come back unchanged but not as the same object"""
+        message = {"type": "conversation_request", "playerName": "Steve", "x": 1}
+
+        result = CompactProtocol.parse(message)
+
+        assert result == message
+        assert result is not message
+
+    @pytest.mark.parametrize(
+        "message, expected",
+        [
+            ({"type": "cr"}, {"type": "conversation_request"}),
+            ({"type": "x", "msg": "hi"}, {"type": "x", "message": "hi"}),
+            ({"type": "x", "data": {"msg": "hi"}}, {"type": "x", "message": "hi"}),
+        ],
+    )
+    def test_non_standard_messages_still_normalized(self, message, expected):
+        """Short types, aliases and data nesting should bypass the fast path"""
+        assert CompactProtocol.parse(message) == expected
@@ -1,16 +1,15 @@
 """
 Unit tests for api/rate_limiter.py (WebSocket Rate Limiter)
 
-Tests the sliding window rate limiting algorithm including:
+Tests the token bucket rate limiting algorithm including:
 - Basic rate limit checking
-- Time window sliding and reset
+- Token refill over time
 - Multi-client isolation
 - Quota calculation
 - Client record clearing
 - Custom configuration
 """
 
-from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
@@ -26,15 +25,16 @@ class TestWebSocketRateLimiter:
         limiter = WebSocketRateLimiter()
 
         assert limiter.max_messages == 100
-        assert limiter.window == timedelta(seconds=60)
-        assert len(limiter.message_times) == 0
+        assert limiter.window_seconds == 60
+        assert len(limiter.buckets) == 0
 
     def test_initialization_with_custom_config(self):
         """Should initialize with custom parameters"""
         limiter = WebSocketRateLimiter(max_messages=10, window_seconds=30)
 
         assert limiter.max_messages == 10
-        assert limiter.window == timedelta(seconds=30)
+        assert limiter.window_seconds == 30
+        assert limiter.rate == pytest.approx(10 / 30)
 
     def test_first_message_passes(self):
         """Should allow first message from new client"""
@@ -44,7 +44,7 @@ class TestWebSocketRateLimiter:
         result = limiter.check_rate_limit(client_id)
 
         assert result is True
-        assert len(limiter.message_times[client_id]) == 1
+        assert limiter.get_remaining_quota(client_id) == 99
 
     def test_messages_under_limit_all_pass(self):
         """Should allow all messages under the limit"""
@@ -56,7 +56,7 @@ class TestWebSocketRateLimiter:
             result = limiter.check_rate_limit(client_id)
             assert result is True, f"Message {i+1} should pass"
 
-        assert len(limiter.message_times[client_id]) == 10
+        assert limiter.get_remaining_quota(client_id) == 0
 
     def test_message_over_limit_rejected(self):
         """Should reject message when limit is exceeded"""
@@ -70,33 +70,46 @@ class TestWebSocketRateLimiter:
         # 6th message should be rejected
         result = limiter.check_rate_limit(client_id)
         assert result is False
-        assert len(limiter.message_times[client_id]) == 5  # Should not record rejected message
+        assert limiter.get_remaining_quota(client_id) == 0  # Rejected message costs nothing
 
-    def test_time_window_sliding_resets_limit(self):
-        """Should reset limit after time window expires"""
+    def test_tokens_refill_after_window(self):
+        """Should refill the bucket after the time window passes"""
         limiter = WebSocketRateLimiter(max_messages=3, window_seconds=60)
         client_id = "client-123"
 
-        # Mock initial time: 2025-12-05 10:00:00 UTC
-        initial_time = datetime(2025, 12, 5, 10, 0, 0, tzinfo=timezone.utc)
-
-        with patch("api.rate_limiter.datetime") as mock_datetime:
-            # Send 3 messages at 10:00:00 (all pass)
-            mock_datetime.now.return_value = initial_time
+        with patch("api.rate_limiter.time") as mock_time:
+            # Send 3 messages at t=1000 (all pass)
+            mock_time.monotonic.return_value = 1000.0
             for _ in range(3):
                 assert limiter.check_rate_limit(client_id) is True
 
-            # 4th message at 10:00:00 should be rejected
+            # 4th message at the same instant should be rejected
             result = limiter.check_rate_limit(client_id)
             assert result is False
 
             # Advance time by 61 seconds (beyond window)
-            mock_datetime.now.return_value = initial_time + timedelta(seconds=61)
+            mock_time.monotonic.return_value = 1061.0
 
-            # Old records should be cleaned, new message should pass
+            # Bucket is full again, new message should pass
             result = limiter.check_rate_limit(client_id)
             assert result is True
-            assert len(limiter.message_times[client_id]) == 1  # Only 1 message in new window
+            assert limiter.get_remaining_quota(client_id) == 2
+
+    def test_tokens_refill_gradually(self):
+        """Should refill one token per window / max_messages seconds"""
+        limiter = WebSocketRateLimiter(max_messages=3, window_seconds=60)
+        client_id = "client-123"
+
+        with patch("api.rate_limiter.time") as mock_time:
+            mock_time.monotonic.return_value = 1000.0
+            for _ in range(3):
+                limiter.check_rate_limit(client_id)
+            assert limiter.check_rate_limit(client_id) is False
+
+            # 20 seconds refill exactly one token
+            mock_time.monotonic.return_value = 1020.0
+            assert limiter.check_rate_limit(client_id) is True
+            assert limiter.check_rate_limit(client_id) is False
 
     def test_multiple_clients_isolated(self):
         """Should isolate rate limits per client"""
@@ -117,8 +130,8 @@ class TestWebSocketRateLimiter:
         assert limiter.check_rate_limit(client_a) is False
 
         # Client B should still pass (3 messages sent, limit not reached)
-        assert len(limiter.message_times[client_a]) == 3
-        assert len(limiter.message_times[client_b]) == 3
+        assert limiter.get_remaining_quota(client_a) == 0
+        assert limiter.get_remaining_quota(client_b) == 0
 
     def test_get_remaining_quota_correct(self):
         """Should calculate remaining quota correctly"""
@@ -142,16 +155,14 @@ class TestWebSocketRateLimiter:
         # Remaining quota should be 0
         assert limiter.get_remaining_quota(client_id) == 0
 
-    def test_get_remaining_quota_cleans_expired_records(self):
-        """Should clean expired records when calculating quota"""
+    def test_get_remaining_quota_includes_refill(self):
+        """Should account for refilled tokens when calculating quota"""
         limiter = WebSocketRateLimiter(max_messages=5, window_seconds=60)
         client_id = "client-123"
 
-        initial_time = datetime(2025, 12, 5, 10, 0, 0, tzinfo=timezone.utc)
-
-        with patch("api.rate_limiter.datetime") as mock_datetime:
-            # Send 5 messages at 10:00:00
-            mock_datetime.now.return_value = initial_time
+        with patch("api.rate_limiter.time") as mock_time:
+            # Send 5 messages at t=1000
+            mock_time.monotonic.return_value = 1000.0
             for _ in range(5):
                 limiter.check_rate_limit(client_id)
 
@@ -159,7 +170,7 @@ class TestWebSocketRateLimiter:
             assert limiter.get_remaining_quota(client_id) == 0
 
             # Advance time by 61 seconds
-            mock_datetime.now.return_value = initial_time + timedelta(seconds=61)
+            mock_time.monotonic.return_value = 1061.0
 
             # Quota should be restored to 5
             assert limiter.get_remaining_quota(client_id) == 5
@@ -173,19 +184,18 @@ class TestWebSocketRateLimiter:
         for _ in range(3):
             limiter.check_rate_limit(client_id)
 
-        assert len(limiter.message_times[client_id]) == 3
         assert limiter.check_rate_limit(client_id) is False  # Limit reached
 
         # Clear client records
         limiter.clear(client_id)
 
-        # Client should not exist in message_times
-        assert client_id not in limiter.message_times
+        # Client should not exist in buckets
+        assert client_id not in limiter.buckets
 
         # New message should pass
         result = limiter.check_rate_limit(client_id)
         assert result is True
-        assert len(limiter.message_times[client_id]) == 1
+        assert limiter.get_remaining_quota(client_id) == 2
 
     def test_clear_nonexistent_client_no_error(self):
         """Should handle clearing nonexistent client gracefully"""
@@ -195,4 +205,4 @@ class TestWebSocketRateLimiter:
         # Should not raise error
         limiter.clear(client_id)
 
-        assert client_id not in limiter.message_times
+        assert client_id not in limiter.buckets
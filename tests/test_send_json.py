@@ -0,0 +1,67 @@
+"""
+Unit tests for api/websocket.py send_json_to_mod (/api/ws/send-json)
+
+Tests the debug forwarding endpoint including:
+- Frame content matches model_dump with None fields dropped
+- Metrics and MESSAGE_SENT event recording
+- 503 when no Mod is connected
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import HTTPException
+
+from api.validation import ModMessage
+from api.websocket import send_json_to_mod
+from core.monitor.event_types import MonitorEventType
+
+
+@pytest.fixture
+def deps():
+    """Build event bus, metrics and connection manager mocks"""
+    websocket = AsyncMock()
+    event_bus = Mock()
+    metrics = Mock()
+    metrics.get_connection_status.return_value = Mock(mod_client_id="mod-1")
+    conn_mgr = Mock()
+    conn_mgr.pick_target.return_value = ("mod-1", websocket)
+    return websocket, event_bus, metrics, conn_mgr
+
+
+class TestSendJsonToMod:
+    """Tests for send_json_to_mod"""
+
+    @pytest.mark.asyncio
+    async def test_sends_model_without_none_fields(self, deps):
+        """Should send one text frame equal to model_dump(exclude_none=True)"""
+        websocket, event_bus, metrics, conn_mgr = deps
+        message = ModMessage(
+            type="conversation_request", playerName="Steve", message="你好"
+        )
+
+        result = await send_json_to_mod(message, event_bus, metrics, conn_mgr)
+
+        sent = websocket.send_text.call_args[0][0]
+        assert json.loads(sent) == message.model_dump(exclude_none=True)
+        assert result == {
+            "status": "ok",
+            "target": "mod-1",
+            "type": "conversation_request",
+        }
+        metrics.record_message_sent.assert_called_once_with("conversation_request")
+        assert event_bus.publish.call_args[0][0] == MonitorEventType.MESSAGE_SENT
+
+    @pytest.mark.asyncio
+    async def test_no_connection_returns_503(self, deps):
+        """Should raise 503 when there is no Mod connection"""
+        _, event_bus, metrics, conn_mgr = deps
+        conn_mgr.pick_target.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await send_json_to_mod(
+                ModMessage(type="connection_init"), event_bus, metrics, conn_mgr
+            )
+
+        assert exc_info.value.status_code == 503
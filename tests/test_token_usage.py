@@ -17,6 +17,11 @@ import pytest
 from core.monitor.token_usage import TokenUsageTracker
 
 
+def hour_key(*args):
+    """Epoch-hour key for a UTC datetime built from the given fields"""
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp()) // 3600
+
+
 class TestTokenUsageTracker:
     """Tests for TokenUsageTracker class"""
 
@@ -39,7 +44,6 @@ class TestTokenUsageTracker:
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             # Configure mock to preserve real datetime class methods
             mock_datetime.now.return_value = fixed_time
-            mock_datetime.strptime = datetime.strptime  # Use real strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
 
             # Record tokens in same hour
@@ -48,8 +52,7 @@ class TestTokenUsageTracker:
             tracker.record(25)
 
         # Check internal trend data (accessing private attribute for testing)
-        hour_key = "2025-12-05 10:00"
-        assert tracker._trend[hour_key] == 175
+        assert tracker._trend[hour_key(2025, 12, 5, 10)] == 175
 
     def test_record_different_hours_separate_buckets(self):
         """Should store tokens in separate buckets for different hours"""
@@ -60,7 +63,6 @@ class TestTokenUsageTracker:
             mock_datetime.now.return_value = datetime(
                 2025, 12, 5, 10, 0, 0, tzinfo=timezone.utc
             )
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(100)
 
@@ -69,13 +71,12 @@ class TestTokenUsageTracker:
             mock_datetime.now.return_value = datetime(
                 2025, 12, 5, 11, 0, 0, tzinfo=timezone.utc
             )
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(200)
 
         # Verify separate buckets
-        assert tracker._trend["2025-12-05 10:00"] == 100
-        assert tracker._trend["2025-12-05 11:00"] == 200
+        assert tracker._trend[hour_key(2025, 12, 5, 10)] == 100
+        assert tracker._trend[hour_key(2025, 12, 5, 11)] == 200
 
     def test_record_cleans_up_expired_data(self):
         """Should remove data older than 24 hours"""
@@ -86,7 +87,6 @@ class TestTokenUsageTracker:
         # Record token at 12:00
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             mock_datetime.now.return_value = base_time
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(100)
 
@@ -94,13 +94,12 @@ class TestTokenUsageTracker:
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             future_time = base_time + timedelta(hours=25)
             mock_datetime.now.return_value = future_time
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(200)
 
         # Old data (12:00) should be removed
-        assert "2025-12-05 12:00" not in tracker._trend
-        assert "2025-12-06 13:00" in tracker._trend
+        assert hour_key(2025, 12, 5, 12) not in tracker._trend
+        assert hour_key(2025, 12, 6, 13) in tracker._trend
 
     def test_get_trend_returns_24_hours(self):
         """Should return trend with exactly 24 hourly points"""
@@ -110,7 +109,6 @@ class TestTokenUsageTracker:
 
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             mock_datetime.now.return_value = fixed_time
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(500)
 
@@ -136,7 +134,6 @@ class TestTokenUsageTracker:
 
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             mock_datetime.now.return_value = fixed_time
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(300)
 
@@ -156,7 +153,6 @@ class TestTokenUsageTracker:
             # Record tokens across multiple hours
             for hour_offset in [0, 1, 2]:
                 mock_datetime.now.return_value = base_time + timedelta(hours=hour_offset)
-                mock_datetime.strptime = datetime.strptime
                 mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
                 tracker.record(100)
 
@@ -203,7 +199,6 @@ class TestTokenUsageTracker:
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             time_before = datetime(2025, 12, 5, 9, 59, 59, tzinfo=timezone.utc)
             mock_datetime.now.return_value = time_before
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(100)
 
@@ -211,13 +206,12 @@ class TestTokenUsageTracker:
         with patch("core.monitor.token_usage.datetime") as mock_datetime:
             time_after = datetime(2025, 12, 5, 10, 0, 1, tzinfo=timezone.utc)
             mock_datetime.now.return_value = time_after
-            mock_datetime.strptime = datetime.strptime
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
             tracker.record(200)
 
         # Should be in different buckets
-        assert tracker._trend["2025-12-05 09:00"] == 100
-        assert tracker._trend["2025-12-05 10:00"] == 200
+        assert tracker._trend[hour_key(2025, 12, 5, 9)] == 100
+        assert tracker._trend[hour_key(2025, 12, 5, 10)] == 200
 
     def test_empty_tracker_returns_zero_trend(self):
         """Should return trend with all zeros when no tokens recorded"""